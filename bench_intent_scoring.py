@@ -0,0 +1,80 @@
+"""
+Micro-benchmark: per-intent cos_sim loop vs. stacked IntentIndex scoring.
+
+Uses random unit vectors shaped like all-MiniLM-L6-v2 output (384 dims), so
+no model download is needed. Run from the project root:
+
+    python bench_intent_scoring.py
+"""
+import time
+import numpy as np
+
+from brain.intent_index import IntentIndex
+
+try:
+    import torch
+    from sentence_transformers import util
+except ImportError:
+    torch = None
+
+DIM = 384
+PHRASES_PER_INTENT = 6
+INTENT_COUNTS = [20, 200, 2000]
+REPEATS = 200
+
+
+def _unit(rows: int) -> np.ndarray:
+    m = np.random.default_rng(rows).standard_normal((rows, DIM)).astype(np.float32)
+    return m / np.linalg.norm(m, axis=1, keepdims=True)
+
+
+def loop_scoring(query, intent_embeddings):
+    """The original IntentJudge.detect_intent scoring loop."""
+    scores = []
+    for intent, emb in intent_embeddings.items():
+        if torch is not None:
+            score = util.cos_sim(query, emb).max().item()
+        else:
+            score = float((emb @ query).max())
+        scores.append((intent, score))
+    scores.sort(key=lambda x: x[1], reverse=True)
+    return scores
+
+
+def _time(fn, *args) -> float:
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        fn(*args)
+    return (time.perf_counter() - start) / REPEATS * 1000
+
+
+def main():
+    backend = "torch util.cos_sim" if torch is not None else "numpy per-intent loop"
+    print(f"Baseline: {backend} | {PHRASES_PER_INTENT} phrases/intent | {REPEATS} repeats\n")
+    print(f"{'intents':>8} {'loop (ms)':>12} {'index (ms)':>12} {'speedup':>9}")
+
+    for n_intents in INTENT_COUNTS:
+        matrix = _unit(n_intents * PHRASES_PER_INTENT)
+        blocks = {
+            f"intent_{i}": matrix[i * PHRASES_PER_INTENT:(i + 1) * PHRASES_PER_INTENT]
+            for i in range(n_intents)
+        }
+        query = _unit(1)[0]
+
+        index = IntentIndex.from_embeddings(blocks)
+        if torch is not None:
+            loop_blocks = {k: torch.from_numpy(v) for k, v in blocks.items()}
+            loop_query = torch.from_numpy(query)
+        else:
+            loop_blocks, loop_query = blocks, query
+
+        # Both paths must agree before timing them
+        assert loop_scoring(loop_query, loop_blocks)[0][0] == index.rank(query)[0][0]
+
+        before = _time(loop_scoring, loop_query, loop_blocks)
+        after = _time(index.rank, query)
+        print(f"{n_intents:>8} {before:>12.3f} {after:>12.3f} {before / after:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
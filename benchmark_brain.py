@@ -0,0 +1,134 @@
+"""
+End-to-end latency benchmark for CrystalBrain.process / stream_process.
+
+Starts an in-process mock Ollama (brain/mock_ollama.py) unless --url is
+given, points brain.llm at it and replays prompts through the full
+pipeline (router, skills, context assembly, LLM call). Reports p50/p95/p99
+for process() and time-to-first-token / total for stream_process(), plus
+the LLM cache, prefill, per-model and scheduler stats.
+
+    python benchmark_brain.py
+    python benchmark_brain.py --token-ms 30 --prefill-ms 200 --turns 50
+    python benchmark_brain.py --url http://localhost:11434/api/chat   # real Ollama
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+from brain import llm
+from brain.mock_ollama import MockOllama
+
+DEFAULT_PROMPTS = [
+    "tell me a short story about the sea",
+    "what do you think about rainy days",
+    "explain recursion like I am five",
+    "give me a motivational quote",
+    "how are you feeling today",
+]
+
+
+def percentiles(samples) -> dict:
+    lat = np.array(samples)
+    return {
+        "p50": round(float(np.percentile(lat, 50)), 1),
+        "p95": round(float(np.percentile(lat, 95)), 1),
+        "p99": round(float(np.percentile(lat, 99)), 1),
+        "mean": round(float(lat.mean()), 1),
+    }
+
+
+def load_prompts(path: str, limit: int):
+    prompts = list(DEFAULT_PROMPTS)
+    if path and os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            prompts += [u["text"] for u in json.load(f)["utterances"]]
+    return prompts[:limit] if limit else prompts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=None, help="use this Ollama /api/chat URL instead of the mock")
+    parser.add_argument("--prefill-ms", type=float, default=100.0)
+    parser.add_argument("--prompt-token-ms", type=float, default=0.5)
+    parser.add_argument("--token-ms", type=float, default=20.0)
+    parser.add_argument("--corpus", default=os.path.join("core", "routing_corpus.json"))
+    parser.add_argument("--turns", type=int, default=30, help="prompts to replay (0 = all)")
+    parser.add_argument("--no-skills", action="store_true", help="empty skill set: every turn reaches the LLM")
+    parser.add_argument("--out", default=None, help="write the JSON report here")
+    args = parser.parse_args()
+
+    mock = None
+    if args.url:
+        llm.OLLAMA_URL = args.url
+    else:
+        mock = MockOllama(prefill_ms=args.prefill_ms, prompt_token_ms=args.prompt_token_ms, token_ms=args.token_ms)
+        llm.OLLAMA_URL = mock.start()
+
+    from brain.brain import CrystalBrain
+    from brain.memory import Memory
+    from skill_manager import SkillManager
+
+    scratch = tempfile.mkdtemp(prefix="crystal_bench_")
+    with contextlib.redirect_stdout(io.StringIO()):
+        skill_manager = SkillManager(scratch if args.no_skills else "skills")
+        brain = CrystalBrain(skill_manager)
+        brain.agent_mode = False
+        # Keep benchmark turns out of the real conversation memory
+        brain.memory = Memory(file=os.path.join(scratch, "memory.json"))
+
+    prompts = load_prompts(args.corpus, args.turns)
+    process_ms, ttft_ms, stream_ms = [], [], []
+
+    for text in prompts:
+        with contextlib.redirect_stdout(io.StringIO()):
+            started = time.perf_counter()
+            brain.process(text)
+            process_ms.append((time.perf_counter() - started) * 1000)
+
+            started = time.perf_counter()
+            first = None
+            for _ in brain.stream_process(text):
+                if first is None:
+                    first = time.perf_counter()
+            end = time.perf_counter()
+            ttft_ms.append(((first or end) - started) * 1000)
+            stream_ms.append((end - started) * 1000)
+
+    report = {
+        "backend": "mock" if mock else args.url,
+        "mock": {"prefill_ms": args.prefill_ms, "prompt_token_ms": args.prompt_token_ms,
+                 "token_ms": args.token_ms} if mock else None,
+        "turns": len(prompts),
+        "process_ms": percentiles(process_ms),
+        "stream_ttft_ms": percentiles(ttft_ms),
+        "stream_total_ms": percentiles(stream_ms),
+        "llm_requests": mock.requests if mock else None,
+        "llm_cache": llm.cache_stats(),
+        "prefill": llm.prefill_stats(),
+        "models": llm.model_stats(),
+        "scheduler": llm.scheduler_stats(),
+        "router_tiers": brain.routing_stats(),
+    }
+
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+        print(f"✅ Report written to {args.out}")
+    else:
+        print(text)
+
+    if mock:
+        mock.stop()
+    shutil.rmtree(scratch, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
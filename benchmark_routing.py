@@ -0,0 +1,180 @@
+"""
+Routing benchmark and accuracy harness.
+
+Replays the labeled corpus (core/routing_corpus.json) through each routing
+path and reports p50/p95/p99 latency, throughput, accuracy, per-intent
+precision/recall and a confusion matrix as JSON, so runs can be diffed to
+catch regressions after changing thresholds or phrases.
+
+Paths:
+- judge:         IntentJudge.detect_intent ("execute" counts as a prediction)
+- router:        the full IntentRouter cascade
+- skill_bridge:  SkillBridge._find_skill_by_keywords
+- skill_manager: SkillManager keyword fallback (match_skill, no execution)
+
+    python benchmark_routing.py --out routing_benchmark.json
+    python benchmark_routing.py --no-skills   # judge + router only
+"""
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import os
+import time
+from collections import Counter, defaultdict
+
+import numpy as np
+
+from brain.fast_classifier import DEFAULT_MODEL_PATH, FastIntentClassifier
+from brain.intent_judge import IntentJudge
+from brain.router import IntentRouter
+
+NONE = "none"
+
+
+def load_corpus(path: str):
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return data["utterances"], data.get("aliases", {})
+
+
+def run_path(corpus, predict, repeat: int, before_each=None) -> dict:
+    latencies, actions = [], Counter()
+    confusion = defaultdict(Counter)
+
+    for _ in range(repeat):
+        for item in corpus:
+            if before_each:
+                before_each()
+            with contextlib.redirect_stdout(io.StringIO()):
+                started = time.perf_counter()
+                label, action = predict(item["text"])
+                latencies.append((time.perf_counter() - started) * 1000)
+            confusion[item["intent"]][label] += 1
+            actions[action] += 1
+
+    return summarize(latencies, confusion, actions)
+
+
+def summarize(latencies, confusion, actions) -> dict:
+    lat = np.array(latencies)
+    total = int(lat.size)
+    correct = sum(row[intent] for intent, row in confusion.items())
+
+    per_intent = {}
+    labels = set(confusion) | {p for row in confusion.values() for p in row}
+    for label in sorted(labels):
+        tp = confusion[label][label] if label in confusion else 0
+        predicted = sum(row[label] for row in confusion.values())
+        support = sum(confusion[label].values()) if label in confusion else 0
+        per_intent[label] = {
+            "support": support,
+            "precision": round(tp / predicted, 3) if predicted else 0.0,
+            "recall": round(tp / support, 3) if support else 0.0,
+        }
+
+    return {
+        "samples": total,
+        "accuracy": round(correct / total, 4) if total else 0.0,
+        "latency_ms": {
+            "p50": round(float(np.percentile(lat, 50)), 3),
+            "p95": round(float(np.percentile(lat, 95)), 3),
+            "p99": round(float(np.percentile(lat, 99)), 3),
+            "mean": round(float(lat.mean()), 3),
+        },
+        "throughput_per_s": round(total / (lat.sum() / 1000), 1) if lat.sum() else 0.0,
+        "actions": dict(actions),
+        "per_intent": per_intent,
+        "confusion": {k: dict(v) for k, v in sorted(confusion.items())},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", default=os.path.join("core", "routing_corpus.json"))
+    parser.add_argument("--out", default=None, help="write the JSON report here")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--warm", action="store_true", help="keep the route cache between calls")
+    parser.add_argument("--no-skills", action="store_true", help="skip loading skills/ (keyword paths)")
+    args = parser.parse_args()
+
+    corpus, aliases = load_corpus(args.corpus)
+    reverse_alias = {v.lower(): k for k, v in aliases.items()}
+
+    skill_manager = None
+    if not args.no_skills:
+        from skill_manager import SkillManager
+        skill_manager = SkillManager()
+
+    judge = IntentJudge(skill_manager)
+    # The router answers with skill intents, like CrystalBrain's intent_skill_map
+    intents = {i.lower() for s in skill_manager.skills for i in s["supported_intents"]} if skill_manager else None
+    router = IntentRouter(judge, classifier=FastIntentClassifier.load(DEFAULT_MODEL_PATH), intents=intents)
+    cold = None if args.warm else judge.route_cache.clear
+
+    def skill_label(skill_name):
+        intent = judge.intent_for_skill(skill_name)
+        return reverse_alias.get(intent, intent) if intent else NONE
+
+    def judge_predict(text):
+        d = judge.detect_intent(text)
+        return (d["intent"] if d["action"] == "execute" else NONE), d["action"]
+
+    def router_predict(text):
+        d = router.route(text, allow_agent=False)
+        result = d.get("intent_result", {})
+        label = result.get("intent") if result.get("action") == "execute" else NONE
+        return reverse_alias.get(label, label), d["tier"]
+
+    paths = {
+        "judge": run_path(corpus, judge_predict, args.repeat, cold),
+        "router": run_path(corpus, router_predict, args.repeat, cold),
+    }
+
+    if skill_manager:
+        def bridge_predict(text):
+            name = judge.skill_bridge._find_skill_by_keywords(text)
+            return skill_label(name), "match" if name else NONE
+
+        def manager_predict(text):
+            s = skill_manager.match_skill(text)
+            return skill_label(s["name"] if s else None), "match" if s else NONE
+
+        paths["skill_bridge"] = run_path(corpus, bridge_predict, args.repeat)
+        paths["skill_manager"] = run_path(corpus, manager_predict, args.repeat)
+
+    report = {
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "corpus": args.corpus,
+        "utterances": len(corpus),
+        "repeat": args.repeat,
+        "cache": "warm" if args.warm else "cold",
+        "judge_config": {
+            "model": judge.MODEL_NAME,
+            "backend": judge.BACKEND,
+            "high_confidence": judge.HIGH_CONFIDENCE,
+            "medium_confidence": judge.MEDIUM_CONFIDENCE,
+            "ambiguity_margin": judge.AMBIGUITY_MARGIN,
+            "calibrated_intents": judge.intent_thresholds,
+        },
+        "router_tiers": router.stats(),
+        "paths": paths,
+    }
+
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+        print(f"✅ Report written to {args.out}")
+    else:
+        print(text)
+
+    for name, r in paths.items():
+        lat = r["latency_ms"]
+        print(f"{name:>14}: acc {r['accuracy']:.3f} | p50 {lat['p50']} ms | p95 {lat['p95']} ms | "
+              f"p99 {lat['p99']} ms | {r['throughput_per_s']}/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -58,7 +58,8 @@ class SkillArbitrator:
             }
         ]
         try:
-            decision = run_llm(prompt, task_type="skill_routing").strip()
+            # Routing decides the current user turn, so it queues as interactive
+            decision = run_llm(prompt, task_type="skill_routing", priority="interactive").strip()
         except Exception as e:
             print(f"❌ [ARBITRATOR]: LLM classification failed: {e}")
             decision = ""
@@ -0,0 +1,132 @@
+import asyncio
+from typing import Any, Dict, Optional
+
+import httpx
+
+from . import llm
+
+
+class AsyncLLMClient:
+    """
+    asyncio counterpart of llm.generate_response.
+
+    - one pooled httpx.AsyncClient per event loop
+    - requests go through the same priority scheduler as the blocking
+      client (llm._scheduler), so both share one concurrency cap; queued
+      requests wait without blocking the loop
+    - single-flight: identical prompts already in flight share one upstream
+      request instead of queueing their own; if that request's caller is
+      cancelled, a waiting caller takes over and re-issues it
+    - low-temperature calls go through the same ResponseCache as the
+      blocking client
+    """
+
+    def __init__(self):
+        self._loop = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._pending: Dict[str, asyncio.Future] = {}
+
+        self.upstream = 0
+        self.coalesced = 0
+        self.in_flight = 0
+
+    def _bind_loop(self):
+        # asyncio primitives and the client belong to the loop that created them
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(llm.READ_TIMEOUT, connect=llm.CONNECT_TIMEOUT),
+                limits=httpx.Limits(max_connections=llm.POOL_SIZE, max_keepalive_connections=llm.POOL_SIZE),
+            )
+            self._pending = {}
+
+    # =========================================================
+    # GENERATION
+    # =========================================================
+
+    async def generate(self, messages: Any, system_prompt: str = "", temperature: Optional[float] = None,
+                       profile: str = "chat", fmt: Any = None, conversation_id: Optional[str] = None,
+                       priority: Optional[str] = None) -> str:
+        self._bind_loop()
+        key = llm.request_key(messages, system_prompt, temperature, profile, fmt)
+
+        cacheable = llm.is_cacheable(temperature, profile)
+        if cacheable:
+            cached = llm._cache.get(key)
+            if cached is not None:
+                return cached
+
+        pending = self._pending.get(key)
+        while pending is not None:
+            reply = await asyncio.shield(pending)
+            if reply is not _LEADER_GONE:
+                self.coalesced += 1
+                return reply
+            # The leader was cancelled, not us: the first follower back re-issues the request
+            pending = self._pending.get(key)
+
+        future = self._loop.create_future()
+        self._pending[key] = future
+        try:
+            # _post turns HTTP failures into an error reply, so only cancellation escapes
+            payload = llm.build_payload(messages, system_prompt, temperature, profile=profile, fmt=fmt)
+            reply = await self._post(payload, llm.priority_for(profile, priority), conversation_id)
+            future.set_result(reply)
+        except BaseException:
+            # Followers must not inherit this caller's cancellation (or error)
+            future.set_result(_LEADER_GONE)
+            raise
+        finally:
+            self._pending.pop(key, None)
+
+        if cacheable and llm.should_cache(reply):
+            llm._cache.put(key, reply)
+        return reply
+
+    async def _post(self, payload: dict, priority: str, conversation_id: Optional[str] = None) -> str:
+        async with llm._scheduler.aslot(priority):
+            self.in_flight += 1
+            self.upstream += 1
+            try:
+                return await self._post_pooled(payload, conversation_id)
+            finally:
+                self.in_flight -= 1
+
+    async def _post_pooled(self, payload: dict, conversation_id: Optional[str]) -> str:
+        attempts = llm.ChatAttempts(payload, conversation_id)
+        for attempt in attempts:
+            with attempt:
+                resp = await self._client.post(attempt.url, json=payload)
+                resp.raise_for_status()
+                return attempt.succeeded(resp.json())
+        return attempts.error_reply()
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._loop = None
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": self.in_flight,
+            "upstream": self.upstream,
+            "coalesced": self.coalesced,
+        }
+
+
+# Result handed to followers when the leading request was cancelled
+_LEADER_GONE = object()
+
+_client = AsyncLLMClient()
+
+
+async def agenerate_response(messages: Any, system_prompt: str = "", temperature: Optional[float] = None,
+                             profile: str = "chat", fmt: Any = None, conversation_id: Optional[str] = None,
+                             priority: Optional[str] = None) -> str:
+    return await _client.generate(messages, system_prompt, temperature, profile, fmt, conversation_id, priority)
+
+
+def async_stats() -> dict:
+    return _client.stats()
@@ -1,3 +1,5 @@
+import asyncio
+import os
 import threading
 import time
 import json
@@ -5,18 +7,33 @@ from typing import Any, Dict
 
 from .memory import Memory
 from .guard import build_prompt, judge, enforce, Judgment
-from .llm import generate_response
+from .async_llm import agenerate_response
+from .context_builder import REQUIRED, ContextBuilder
+from .json_extract import extract_json
+from .llm import generate_response, stream_response, warm_models
+from .fast_classifier import DEFAULT_MODEL_PATH, FastIntentClassifier
 from .intent_judge import IntentJudge
+from .router import IntentRouter
 from skill_manager import SkillManager
 
 
+class LLMTurn:
+    """An LLM-backed reply that is still to be generated (blocking or streamed)."""
+
+    def __init__(self, messages: list, temperature: float, rules: dict, conversation_id: str = None):
+        self.messages = messages
+        self.temperature = temperature
+        self.rules = rules
+        self.conversation_id = conversation_id
+
+
 class CrystalBrain:
     """
     CrystalBrain v7.0 — Autonomous Agent Core
 
     Architecture:
     - Manual Skill Lock Mode
-    - Semantic Intent Routing
+    - Cost-Ordered Routing Cascade (exact → keyword → semantic → LLM)
     - Autonomous Multi-Step Agent Loop
     - Deterministic Skill Execution
     - Safe LLM Fallback
@@ -38,16 +55,30 @@ class CrystalBrain:
         # Skill Lock Mode
         self.active_skill = None
 
+        # Keeps this conversation on one LLM host when several are configured
+        self.conversation_id = "crystal"
+
         # Autonomous Agent Settings
         self.agent_mode = True
         self.max_agent_steps = 5
 
-        # Intent Engine
-        self.judge = IntentJudge(self.skill_manager)
+        # Intent Engine (model loads in the background; keyword routing until ready)
+        self.judge = IntentJudge(self.skill_manager, background=True)
+        self.judge.start_watcher()
 
         # Map intents → skill instances
         self.intent_skill_map = self._build_intent_skill_map()
 
+        # Cost-ordered routing cascade in front of the judge and the LLM
+        self.router = IntentRouter(
+            self.judge,
+            classifier=FastIntentClassifier.load(os.getenv("CRYSTAL_FAST_CLASSIFIER", DEFAULT_MODEL_PATH)),
+            intents=self.intent_skill_map
+        )
+
+        # Load the small and large LLMs now, not on the first user turn
+        threading.Thread(target=warm_models, daemon=True).start()
+
         # Background monitor
         self.monitor_active = True
         self.monitor_thread = threading.Thread(
@@ -58,11 +89,48 @@ class CrystalBrain:
 
         print(f"🌌 Crystal Brain v7 Online. {len(self.intent_skill_map)} intents mapped.")
 
+    @property
+    def semantic_ready(self) -> bool:
+        return self.judge.is_ready
+
+    def routing_stats(self) -> dict:
+        return self.router.stats()
+
     # ==================================================
     # MAIN PROCESS PIPELINE
     # ==================================================
 
     def process(self, user_text: str) -> str:
+        reply = self._respond(user_text)
+        if isinstance(reply, LLMTurn):
+            return self._complete(reply)
+        return reply
+
+    async def aprocess(self, user_text: str, conversation_id: str = None) -> str:
+        """
+        process() for asyncio callers: routing and skills run in a worker
+        thread, the LLM call itself awaits the async client.
+        """
+        reply = await asyncio.to_thread(self._respond, user_text)
+        if isinstance(reply, LLMTurn):
+            reply.conversation_id = conversation_id or reply.conversation_id
+            return await self._acomplete(reply)
+        return reply
+
+    def stream_process(self, user_text, conversation_id: str = None):
+        """
+        Yields the reply as it is produced: real Ollama tokens for LLM-backed
+        turns (fallback and synthesis), a single chunk for everything else.
+        """
+        reply = self._respond(user_text)
+        if isinstance(reply, LLMTurn):
+            reply.conversation_id = conversation_id or reply.conversation_id
+            yield from self._stream(reply)
+        elif reply is not None:
+            yield str(reply)
+
+    def _respond(self, user_text: str):
+        """Routes and runs the request; LLM-backed replies come back as an LLMTurn."""
         self._trace("RECV", "GUI", user_text)
 
         user_text = user_text.strip()
@@ -84,38 +152,43 @@ class CrystalBrain:
             return "🔓 Returned to global mode."
 
         # ------------------------------------------------
-        # 2️⃣ LOCKED MODE EXECUTION
+        # 2️⃣ ROUTING CASCADE (cheapest tier that answers wins)
         # ------------------------------------------------
 
-        if self.active_skill:
-            skill = self.intent_skill_map.get(self.active_skill)
-            if skill:
-                result = skill.run({
-                    "user_input": user_text,
-                    "intent": self.active_skill,
-                    "mode": "locked"
-                })
-                return result
+        locked = self.active_skill if self.active_skill in self.intent_skill_map else None
+        decision = self.router.route(user_text, active_skill=locked, allow_agent=self.agent_mode)
+        route = decision["route"]
 
         # ------------------------------------------------
-        # 3️⃣ SEMANTIC INTENT DETECTION
+        # 3️⃣ LOCKED MODE / LEARNED TRIGGERS
         # ------------------------------------------------
 
-        intent_result = self.judge.detect_intent(user_text)
+        if route == "locked":
+            skill = self.intent_skill_map[locked]
+            return skill.run({
+                "user_input": user_text,
+                "intent": locked,
+                "mode": "locked"
+            })
 
-        action = intent_result.get("action")
-        intent_name = intent_result.get("intent", "").lower()
-        confidence = intent_result.get("confidence", 1.0)
+        if route == "learned":
+            return decision["response"]
 
         # ------------------------------------------------
         # 4️⃣ AUTONOMOUS AGENT TRIGGER
         # ------------------------------------------------
 
-        if self.agent_mode:
-            complex_markers = [" and ", " then ", "after that", "also"]
+        if route == "agent":
+            return self._run_agent(user_text)
 
-            if any(marker in lowered for marker in complex_markers):
-                return self._run_agent(user_text)
+        if route == "llm":
+            return self._llm_fallback_turn(user_text)
+
+        intent_result = decision["intent_result"]
+
+        action = intent_result.get("action")
+        intent_name = intent_result.get("intent", "").lower()
+        confidence = intent_result.get("confidence", 1.0)
 
         # ------------------------------------------------
         # 5️⃣ LOW CONFIDENCE SUGGESTION
@@ -142,7 +215,7 @@ class CrystalBrain:
                 if isinstance(skill_output, str) and len(skill_output) < 500:
                     return skill_output
 
-                return self._synthesize(user_text, skill_output)
+                return self._synthesize_turn(user_text, skill_output)
 
         # ------------------------------------------------
         # 7️⃣ CONFIRM / CLARIFY
@@ -159,7 +232,7 @@ class CrystalBrain:
         # 8️⃣ LLM FALLBACK
         # ------------------------------------------------
 
-        return self._llm_fallback(user_text)
+        return self._llm_fallback_turn(user_text)
 
     # ==================================================
     # AUTONOMOUS AGENT LOOP
@@ -197,12 +270,14 @@ class CrystalBrain:
         return "\n".join(results)
 
     def _agent_plan(self, goal: str) -> dict:
+        skills = sorted(self.intent_skill_map)
         messages = [
             {
                 "role": "system",
                 "content": (
                     "You are a task planner. "
                     "Break the user request into executable skill steps. "
+                    f"Available skills: {', '.join(skills)}.\n"
                     "Return strict JSON format:\n"
                     "{ \"steps\": [ {\"skill\": \"intent_name\", \"input\": \"text\"} ] }"
                 )
@@ -210,66 +285,137 @@ class CrystalBrain:
             {"role": "user", "content": goal}
         ]
 
-        raw = generate_response(messages=messages, temperature=0.1)
-
-        try:
-            return json.loads(raw)
-        except:
+        raw = generate_response(messages=messages, profile="plan", fmt=self._plan_schema(skills))
+
+        # Structured output should already be valid; the extractor still skips
+        # fences and prefixes. Steps run skills with side effects, so a cut-off
+        # plan (e.g. a half-written email body) is rejected rather than repaired.
+        return self._validate_plan(extract_json(raw, partial=False))
+
+    def _plan_schema(self, skills: list) -> dict:
+        skill = {"type": "string", "enum": skills} if skills else {"type": "string"}
+        return {
+            "type": "object",
+            "properties": {
+                "steps": {
+                    "type": "array",
+                    "maxItems": self.max_agent_steps,
+                    "items": {
+                        "type": "object",
+                        "properties": {"skill": skill, "input": {"type": "string"}},
+                        "required": ["skill", "input"],
+                    },
+                },
+            },
+            "required": ["steps"],
+        }
+
+    def _validate_plan(self, plan: Any) -> dict:
+        """Keeps only steps that name a known intent; {} when nothing usable is left."""
+        if isinstance(plan, list):
+            plan = {"steps": plan}
+        if not isinstance(plan, dict) or not isinstance(plan.get("steps"), list):
+            self._trace("FAIL", "AGENT", "planner returned no usable JSON")
             return {}
 
+        steps = []
+        for step in plan["steps"]:
+            if not isinstance(step, dict):
+                continue
+            skill_name = str(step.get("skill", "")).lower().strip()
+            if skill_name not in self.intent_skill_map:
+                self._trace("DROP", "AGENT", f"unknown skill in plan: {skill_name or '?'}")
+                continue
+            step_input = step.get("input", "")
+            steps.append({"skill": skill_name, "input": step_input if isinstance(step_input, str) else json.dumps(step_input)})
+
+        return {"steps": steps} if steps else {}
+
     # ==================================================
     # SYNTHESIS
     # ==================================================
 
     def _synthesize(self, user_text: str, skill_output: str) -> str:
+        return self._complete(self._synthesize_turn(user_text, skill_output))
+
+    def _synthesize_turn(self, user_text: str, skill_output: str) -> "LLMTurn":
         recall = self.memory.query_entities(user_text) or "No prior context."
         gate = build_prompt(user_text)
 
-        final_messages = [
-            {"role": "system", "content": gate["system_prompt"]},
-            *self.memory.context(last_n=6),
-            {
-                "role": "user",
-                "content": (
-                    f"CONTEXT: {recall}\n"
-                    f"SKILL DATA: {skill_output}\n"
-                    f"USER: {user_text}\n\n"
-                    "Respond naturally using SKILL DATA as truth."
-                )
-            }
-        ]
-
-        final = generate_response(
-            messages=final_messages,
-            temperature=self.temp_conversation,
+        final_messages, _ = (
+            ContextBuilder()
+            .add("system", gate["system_prompt"], REQUIRED, "gate")
+            .add("system", self.memory.system_prompt["content"], 90, "persona")
+            .add_history(self.memory.history[-6:])
+            .add("system", f"CONTEXT: {recall}", 60, "recall")
+            .add("system", f"SKILL DATA: {skill_output}", 80, "skill_data", truncatable=True)
+            .add(
+                "user",
+                f"USER: {user_text}\n\nRespond naturally using SKILL DATA as truth.",
+                REQUIRED, "user",
+            )
+            .build()
         )
 
-        if judge(final, gate["rules"]) == Judgment.FAIL:
-            final = enforce(final, gate["rules"])
-
-        self.memory.add("assistant", final)
-        return final
+        return LLMTurn(final_messages, self.temp_conversation, gate["rules"], self.conversation_id)
 
     # ==================================================
     # LLM FALLBACK
     # ==================================================
 
     def _llm_fallback(self, user_text: str) -> str:
+        return self._complete(self._llm_fallback_turn(user_text))
+
+    def _llm_fallback_turn(self, user_text: str) -> "LLMTurn":
         gate = build_prompt(user_text)
 
-        messages = [
-            {"role": "system", "content": gate["system_prompt"]},
-            *self.memory.context(last_n=6),
-            {"role": "user", "content": user_text}
-        ]
+        messages, _ = (
+            ContextBuilder()
+            .add("system", gate["system_prompt"], REQUIRED, "gate")
+            .add("system", self.memory.system_prompt["content"], 90, "persona")
+            .add_history(self.memory.history[-6:])
+            .add("user", user_text, REQUIRED, "user")
+            .build()
+        )
+
+        return LLMTurn(messages, self.temp_conversation, gate["rules"], self.conversation_id)
+
+    # ==================================================
+    # LLM TURN EXECUTION
+    # ==================================================
 
+    def _complete(self, turn: "LLMTurn") -> str:
         response = generate_response(
-            messages=messages,
-            temperature=self.temp_conversation,
+            messages=turn.messages,
+            temperature=turn.temperature,
+            conversation_id=turn.conversation_id,
         )
+        return self._finish(turn, response)
 
-        if judge(response, gate["rules"]) == Judgment.FAIL:
-            response = enforce(response, gate["rules"])
+    async def _acomplete(self, turn: "LLMTurn") -> str:
+        response = await agenerate_response(
+            messages=turn.messages,
+            temperature=turn.temperature,
+            conversation_id=turn.conversation_id,
+        )
+        return self._finish(turn, response)
+
+    def _stream(self, turn: "LLMTurn"):
+        # A hard word limit is enforced on the full text, so it cannot be streamed
+        if turn.rules.get("max_words"):
+            yield self._complete(turn)
+            return
+
+        parts = []
+        for token in stream_response(messages=turn.messages, temperature=turn.temperature,
+                                     conversation_id=turn.conversation_id):
+            parts.append(token)
+            yield token
+        self._finish(turn, "".join(parts).strip())
+
+    def _finish(self, turn: "LLMTurn", response: str) -> str:
+        if judge(response, turn.rules) == Judgment.FAIL:
+            response = enforce(response, turn.rules)
 
         self.memory.add("assistant", response)
         return response
@@ -305,10 +451,3 @@ class CrystalBrain:
                 time.sleep(10)
             except:
                 time.sleep(10)
-    def stream_process(self, user_text):
-        response = self.process(user_text)
-
-        # Fake token streaming (works even if LLM is not streaming)
-        for word in response.split():
-            yield word + " "
-            time.sleep(0.03)
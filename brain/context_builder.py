@@ -0,0 +1,157 @@
+import os
+from typing import Dict, List, Optional, Tuple
+
+from . import llm
+
+# Tokenizer matching the Ollama model (tokenizer.json from its HF repo); chars/4 without it
+TOKENIZER_PATH = os.getenv("CRYSTAL_TOKENIZER", "models/tokenizer.json")
+
+# Per-message template overhead (role header, end-of-turn tokens)
+MESSAGE_OVERHEAD = 4
+
+REQUIRED = None
+
+
+class TokenEstimator:
+    """
+    Counts prompt tokens with the model's own tokenizer when `tokenizers` and
+    a tokenizer.json are available, otherwise estimates ~4 characters per token.
+    """
+
+    def __init__(self, tokenizer_path: str = TOKENIZER_PATH):
+        self.tokenizer = None
+        self.source = "chars/4"
+        try:
+            from tokenizers import Tokenizer
+            if tokenizer_path and os.path.exists(tokenizer_path):
+                self.tokenizer = Tokenizer.from_file(tokenizer_path)
+                self.source = tokenizer_path
+        except ImportError:
+            pass
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        if self.tokenizer is not None:
+            return len(self.tokenizer.encode(text, add_special_tokens=False).ids)
+        return (len(text) + 3) // 4
+
+    def count_message(self, message: Dict) -> int:
+        return self.count(message.get("content", "")) + MESSAGE_OVERHEAD
+
+    def truncate(self, text: str, tokens: int) -> str:
+        """Longest prefix of text that fits in `tokens`."""
+        if tokens <= 0:
+            return ""
+        if self.tokenizer is not None:
+            enc = self.tokenizer.encode(text, add_special_tokens=False)
+            if len(enc.ids) <= tokens:
+                return text
+            return text[:enc.offsets[tokens - 1][1]]
+        return text[:tokens * 4]
+
+
+_estimator = None
+
+
+def get_estimator() -> TokenEstimator:
+    global _estimator
+    if _estimator is None:
+        _estimator = TokenEstimator()
+    return _estimator
+
+
+class ContextBuilder:
+    """
+    Packs prompt parts into the model's context window by priority.
+
+    Parts are added in prompt order with a priority (higher survives longer)
+    or REQUIRED. build() keeps every required part, then fills what is left
+    of the budget in priority order; a truncatable part that does not fit
+    whole is cut to the remaining space instead of dropped. Kept parts come
+    back in their original order.
+
+    The default budget is num_ctx minus the reply reservation (num_predict)
+    and the messages llm.build_payload adds itself (SYSTEM_CLEAN, dynamic
+    context).
+    """
+
+    def __init__(self, budget: Optional[int] = None, estimator: Optional[TokenEstimator] = None):
+        self.estimator = estimator or get_estimator()
+        self.budget = self.default_budget() if budget is None else budget
+        self.parts: List[dict] = []
+
+    def default_budget(self) -> int:
+        fixed = self.estimator.count_message(llm.SYSTEM_CLEAN)
+        fixed += self.estimator.count(llm.get_dynamic_context()) + MESSAGE_OVERHEAD
+        return llm.NUM_CTX - llm.NUM_PREDICT - fixed
+
+    def add(self, role: str, content: str, priority: Optional[int] = REQUIRED, label: str = "",
+            truncatable: bool = False) -> "ContextBuilder":
+        if content:
+            self.parts.append({
+                "message": {"role": role, "content": content},
+                "priority": priority,
+                "label": label or role,
+                "truncatable": truncatable,
+            })
+        return self
+
+    def add_history(self, history: List[Dict], priority: int = 10, label: str = "history") -> "ContextBuilder":
+        """Older turns get lower priority, so they are the first to go."""
+        turns = [h for h in history if h.get("role") in ("user", "assistant", "system") and h.get("content")]
+        for i, turn in enumerate(turns):
+            self.add(turn["role"], turn["content"], priority + i / len(turns), label)
+        return self
+
+    # =========================================================
+    # PACKING
+    # =========================================================
+
+    def build(self) -> Tuple[List[Dict], dict]:
+        costs = [self.estimator.count_message(p["message"]) for p in self.parts]
+        kept = {}
+
+        remaining = self.budget
+        for i, p in enumerate(self.parts):
+            if p["priority"] is REQUIRED:
+                kept[i] = p["message"]
+                remaining -= costs[i]
+
+        optional = sorted(
+            (i for i, p in enumerate(self.parts) if p["priority"] is not REQUIRED),
+            key=lambda i: -self.parts[i]["priority"],
+        )
+
+        dropped, truncated = [], []
+        for i in optional:
+            p = self.parts[i]
+            if costs[i] <= remaining:
+                kept[i] = p["message"]
+                remaining -= costs[i]
+            elif p["truncatable"] and remaining > MESSAGE_OVERHEAD + 16:
+                # one token kept back for the ellipsis marker
+                content = self.estimator.truncate(p["message"]["content"], remaining - MESSAGE_OVERHEAD - 1)
+                kept[i] = {**p["message"], "content": content + " …"}
+                truncated.append(p["label"])
+                remaining -= self.estimator.count_message(kept[i])
+            else:
+                dropped.append(i)
+
+        messages = [kept[i] for i in sorted(kept)]
+        report = {
+            "budget": self.budget,
+            "used": self.budget - remaining,
+            "dropped": [self.parts[i]["label"] for i in dropped],
+            "dropped_tokens": sum(costs[i] for i in dropped),
+            "truncated": truncated,
+            "estimator": self.estimator.source,
+        }
+
+        if dropped or truncated or remaining < 0:
+            print(
+                f"🧮 [CONTEXT]: {report['used']}/{self.budget} tokens | dropped {len(dropped)} "
+                f"({report['dropped_tokens']} tokens: {', '.join(report['dropped']) or '-'}) | "
+                f"truncated: {', '.join(truncated) or '-'}"
+            )
+        return messages, report
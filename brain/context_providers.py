@@ -0,0 +1,153 @@
+import datetime
+import threading
+import time
+from typing import Any, Callable, Dict
+
+import psutil
+
+
+class ContextProviders:
+    """
+    Registry of background-sampled context values for LLM prompts.
+
+    Each provider is a callable sampled on its own TTL in the background;
+    prompts only ever read the cached snapshot, so sensor and network I/O
+    never runs on the LLM call path. A provider returning None (or raising)
+    keeps its previous value.
+
+    Cheap providers share one daemon thread and take their first sample on
+    register. Slow (network-bound) providers start from their placeholder
+    default and are sampled on a thread of their own, so a stalled lookup
+    delays neither the caller nor the other providers.
+    """
+
+    def __init__(self, tick: float = 1.0):
+        self.tick = tick
+        self._providers: Dict[str, dict] = {}
+        self._values: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def register(self, name: str, fn: Callable[[], Any], ttl: float = 60.0, default: Any = None,
+                 slow: bool = False):
+        """
+        Adds (or replaces) a provider. A cheap one is sampled right away; a
+        slow one serves `default` until its own thread has a first sample.
+        """
+        provider = {"fn": fn, "ttl": ttl, "due": 0.0, "slow": slow}
+        with self._lock:
+            self._providers[name] = provider
+            if default is not None:
+                self._values.setdefault(name, default)
+
+        if slow:
+            threading.Thread(target=self._slow_loop, args=(name, provider), daemon=True,
+                             name=f"context-{name}").start()
+            return
+        self._sample(name)
+        self.start()
+
+    def unregister(self, name: str):
+        with self._lock:
+            self._providers.pop(name, None)
+            self._values.pop(name, None)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._values)
+
+    def get(self, name: str, default: Any = None) -> Any:
+        with self._lock:
+            return self._values.get(name, default)
+
+    # =========================================================
+    # SAMPLING
+    # =========================================================
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, daemon=True, name="context-providers")
+            self._thread.start()
+
+    def _loop(self):
+        while True:
+            now = time.monotonic()
+            with self._lock:
+                due = [name for name, p in self._providers.items() if not p["slow"] and p["due"] <= now]
+            for name in due:
+                self._sample(name)
+            time.sleep(self.tick)
+
+    def _slow_loop(self, name: str, provider: dict):
+        # Runs until the provider is unregistered or replaced
+        while True:
+            with self._lock:
+                if self._providers.get(name) is not provider:
+                    return
+            self._sample(name)
+            if provider["due"] == float("inf"):
+                return
+            time.sleep(max(provider["due"] - time.monotonic(), self.tick))
+
+    def _sample(self, name: str):
+        with self._lock:
+            provider = self._providers.get(name)
+        if provider is None:
+            return
+
+        try:
+            value = provider["fn"]()
+        except Exception as e:
+            print(f"⚠️ [CONTEXT]: provider '{name}' failed: {e}")
+            value = None
+
+        with self._lock:
+            if name not in self._providers:
+                return
+            if value is not None:
+                self._values[name] = value
+            ttl = provider["ttl"]
+            # ttl <= 0: sample once, never again
+            provider["due"] = time.monotonic() + ttl if ttl > 0 else float("inf")
+
+
+# =========================================================
+# DEFAULT PROVIDERS
+# =========================================================
+
+def _time_now() -> str:
+    return datetime.datetime.now().strftime("%I:%M %p, %A, %B %d, %Y")
+
+
+def _battery() -> str:
+    battery = psutil.sensors_battery()
+    if not battery:
+        return "Unknown"
+    charging = "charging" if battery.power_plugged else "not charging"
+    return f"{battery.percent}%, {charging}"
+
+
+# Used until LocationSkill registers a live "location" provider
+DEFAULT_LOCATION = "Nairobi, Kenya"
+
+providers = ContextProviders()
+_defaults_lock = threading.Lock()
+_defaults_registered = False
+
+
+def register_provider(name: str, fn: Callable[[], Any], ttl: float = 60.0, default: Any = None,
+                      slow: bool = False):
+    providers.register(name, fn, ttl, default, slow)
+
+
+def register_defaults():
+    """Time and battery; safe to call more than once."""
+    global _defaults_registered
+    with _defaults_lock:
+        if _defaults_registered:
+            return
+        _defaults_registered = True
+
+    # Prompts show the time to the minute, so a few seconds of staleness is invisible
+    providers.register("time", _time_now, ttl=5.0)
+    providers.register("battery", _battery, ttl=60.0)
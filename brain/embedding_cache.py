@@ -0,0 +1,168 @@
+import hashlib
+import json
+import os
+import re
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+
+class EmbeddingCache:
+    """
+    Content-addressed on-disk cache for phrase embeddings.
+
+    Rows are keyed by sha256(model name + phrase) and stored as a single .npy
+    matrix that is memory-mapped on load. When the requested phrases match
+    the stored order, the mapped rows are returned without copying; otherwise
+    only unseen phrases are encoded and the matrix is rewritten in request
+    order so the next start is a zero-copy hit.
+
+    The keys file names the current matrix file. Each rewrite goes to a new
+    content-named .npy instead of replacing the old one, because Windows
+    cannot replace a file that is still mapped (by the live IntentIndex);
+    superseded matrices are deleted once nothing maps them any more.
+    """
+
+    def __init__(self, model_name: str, cache_dir: str = "core/embedding_cache"):
+        self.model_name = model_name
+        self.cache_dir = cache_dir
+
+        safe_name = re.sub(r"[^A-Za-z0-9_.-]", "_", model_name)
+        self.safe_name = safe_name
+        self.keys_path = os.path.join(cache_dir, f"{safe_name}.keys.json")
+
+    def key(self, phrase: str) -> str:
+        return hashlib.sha256(f"{self.model_name}\0{phrase}".encode("utf-8")).hexdigest()
+
+    # =========================================================
+    # LOOKUP
+    # =========================================================
+
+    def get_or_encode(self, phrases: List[str], encode_fn: Callable[[List[str]], np.ndarray]) -> np.ndarray:
+        keys = [self.key(p) for p in phrases]
+        stored_keys, stored = self._load()
+
+        if stored is not None and stored_keys == keys:
+            print(f"💾 [EMBED CACHE]: {len(keys)} phrases mapped from disk.")
+            return stored
+
+        row_of = {k: i for i, k in enumerate(stored_keys)}
+        todo = {}
+        for phrase, k in zip(phrases, keys):
+            if k not in row_of and k not in todo:
+                todo[k] = phrase
+
+        fresh = {}
+        if todo:
+            encoded = np.asarray(encode_fn(list(todo.values())), dtype=np.float32)
+            fresh = dict(zip(todo.keys(), encoded))
+
+        dim = self._dim(stored, fresh)
+        matrix = np.empty((len(keys), dim), dtype=np.float32)
+        for row, k in enumerate(keys):
+            matrix[row] = fresh[k] if k in fresh else stored[row_of[k]]
+
+        # Rows are copied out; release the mapping before the cache files change
+        _close(stored)
+        del stored
+
+        print(f"💾 [EMBED CACHE]: {len(keys) - len(todo)} cached, {len(todo)} encoded.")
+
+        if self._save(keys, matrix):
+            _, mapped = self._load()
+            if mapped is not None:
+                return mapped
+        return matrix
+
+    # =========================================================
+    # STORAGE
+    # =========================================================
+
+    @property
+    def matrix_path(self) -> Optional[str]:
+        """Current matrix file named by the keys file (None if there is no cache yet)."""
+        manifest = self._manifest()
+        return os.path.join(self.cache_dir, manifest["matrix"]) if manifest else None
+
+    def _manifest(self) -> Optional[dict]:
+        if not os.path.exists(self.keys_path):
+            return None
+        with open(self.keys_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if isinstance(manifest, list):
+            # Older caches: a bare key list next to <model>.npy
+            manifest = {"matrix": f"{self.safe_name}.npy", "keys": manifest}
+        return manifest
+
+    def _load(self) -> Tuple[List[str], Optional[np.ndarray]]:
+        try:
+            manifest = self._manifest()
+            if manifest is None:
+                return [], None
+            path = os.path.join(self.cache_dir, manifest["matrix"])
+            if not os.path.exists(path):
+                return [], None
+            keys = manifest["keys"]
+            matrix = np.load(path, mmap_mode="r")
+        except Exception as e:
+            print(f"⚠️ [EMBED CACHE]: Ignoring unreadable cache: {e}")
+            return [], None
+
+        if matrix.ndim != 2 or matrix.shape[0] != len(keys):
+            _close(matrix)
+            return [], None
+        return keys, matrix
+
+    def _save(self, keys: List[str], matrix: np.ndarray) -> bool:
+        digest = hashlib.sha256("\n".join(keys).encode("utf-8")).hexdigest()[:16]
+        name = f"{self.safe_name}.{digest}.npy"
+        path = os.path.join(self.cache_dir, name)
+        tmp_matrix = path + ".tmp.npy"
+        tmp_keys = self.keys_path + ".tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Same keys → same rows; an existing file may be mapped, so leave it alone
+            if not os.path.exists(path):
+                np.save(tmp_matrix, matrix)
+                os.replace(tmp_matrix, path)
+
+            with open(tmp_keys, "w", encoding="utf-8") as f:
+                json.dump({"matrix": name, "keys": keys}, f)
+            os.replace(tmp_keys, self.keys_path)
+        except Exception as e:
+            print(f"⚠️ [EMBED CACHE]: Could not write cache: {e}")
+            for tmp in (tmp_matrix, tmp_keys):
+                _remove(tmp)
+            return False
+
+        self._prune(keep=name)
+        return True
+
+    def _prune(self, keep: str):
+        """Deletes superseded matrices and stray tmp files; ones still mapped go on a later save."""
+        # <name>.npy (older layout), <name>.<digest>.npy and their .tmp.npy leftovers
+        pattern = re.compile(rf"{re.escape(self.safe_name)}(\.[0-9a-f]{{16}})?\.npy(\.tmp\.npy)?")
+        for entry in os.listdir(self.cache_dir):
+            if entry != keep and pattern.fullmatch(entry):
+                _remove(os.path.join(self.cache_dir, entry))
+
+    @staticmethod
+    def _dim(stored: Optional[np.ndarray], fresh: dict) -> int:
+        if fresh:
+            return len(next(iter(fresh.values())))
+        if stored is not None:
+            return stored.shape[1]
+        return 0
+
+
+def _close(matrix: Optional[np.ndarray]):
+    mm = getattr(matrix, "_mmap", None)
+    if mm is not None:
+        mm.close()
+
+
+def _remove(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
@@ -0,0 +1,147 @@
+import os
+import re
+import zlib
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+DEFAULT_MODEL_PATH = os.path.join("core", "fast_intent_model.npz")
+N_FEATURES = 2 ** 18
+# Training label for off-topic text; predicting it means "no intent"
+NONE_LABEL = "none"
+
+
+class FastIntentClassifier:
+    """
+    Tiny linear intent classifier over hashed word and character n-grams.
+
+    Trained offline from the intent phrases (see build_fast_classifier.py),
+    it answers in well under a millisecond. Only rows for n-grams seen in
+    training are stored, so the artifact stays a few hundred KB. Predictions
+    below `min_confidence`, on text made mostly of unseen n-grams, or of the
+    NONE_LABEL class (off-topic examples) are returned as None so the caller
+    can fall through to IntentJudge.
+    """
+
+    def __init__(self, rows: np.ndarray, weights: np.ndarray, bias: np.ndarray, labels: List[str],
+                 min_confidence: float = 0.8, min_coverage: float = 0.5):
+        self.rows = np.asarray(rows, dtype=np.int64)           # sorted hashed feature ids
+        self.weights = np.asarray(weights, dtype=np.float32)   # (len(rows), n_labels)
+        self.bias = np.asarray(bias, dtype=np.float32)
+        self.labels = list(labels)
+        self.min_confidence = min_confidence
+        self.min_coverage = min_coverage
+
+    # =========================================================
+    # FEATURES
+    # =========================================================
+
+    @staticmethod
+    def features(text: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Hashed (ids, values) for word 1-2 grams and char 3-grams, L2-normalized."""
+        words = re.findall(r"[a-z0-9']+", text.lower())
+        grams = [f"w:{w}" for w in words]
+        grams += [f"b:{a}_{b}" for a, b in zip(words, words[1:])]
+        for w in words:
+            padded = f"<{w}>"
+            grams += [f"c:{padded[i:i + 3]}" for i in range(len(padded) - 2)]
+
+        if not grams:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+
+        ids, counts = np.unique(
+            [zlib.crc32(g.encode("utf-8")) % N_FEATURES for g in grams],
+            return_counts=True
+        )
+        values = counts.astype(np.float32)
+        return ids.astype(np.int64), values / np.linalg.norm(values)
+
+    # =========================================================
+    # INFERENCE
+    # =========================================================
+
+    def predict_proba(self, text: str) -> Tuple[np.ndarray, float]:
+        """Label probabilities plus the share of the text's n-grams seen in training."""
+        ids, values = self.features(text)
+        if not len(ids):
+            return np.full(len(self.labels), 1.0 / len(self.labels)), 0.0
+
+        pos = np.searchsorted(self.rows, ids)
+        pos = np.minimum(pos, len(self.rows) - 1)
+        known = self.rows[pos] == ids
+
+        logits = values[known] @ self.weights[pos[known]] + self.bias
+        logits -= logits.max()
+        probs = np.exp(logits)
+        return probs / probs.sum(), float(known.mean())
+
+    def predict(self, text: str) -> Optional[Tuple[str, float]]:
+        probs, coverage = self.predict_proba(text)
+        best = int(np.argmax(probs))
+        confidence = float(probs[best])
+
+        if coverage < self.min_coverage or confidence < self.min_confidence:
+            return None
+        if self.labels[best] == NONE_LABEL:
+            return None
+        return self.labels[best], confidence
+
+    # =========================================================
+    # TRAINING
+    # =========================================================
+
+    @classmethod
+    def train(cls, examples: Iterable[Tuple[str, str]], epochs: int = 40, lr: float = 0.5,
+              l2: float = 1e-4, seed: int = 0) -> "FastIntentClassifier":
+        """Multinomial logistic regression, plain SGD over sparse rows."""
+        examples = [(t, label) for t, label in examples if t.strip()]
+        labels = sorted({label for _, label in examples})
+        label_idx = {label: i for i, label in enumerate(labels)}
+
+        encoded = [cls.features(t) for t, _ in examples]
+        rows = np.unique(np.concatenate([ids for ids, _ in encoded]))
+        local = [(np.searchsorted(rows, ids), vals) for ids, vals in encoded]
+        targets = np.array([label_idx[label] for _, label in examples])
+
+        weights = np.zeros((len(rows), len(labels)), dtype=np.float32)
+        bias = np.zeros(len(labels), dtype=np.float32)
+        rng = np.random.default_rng(seed)
+
+        for _ in range(epochs):
+            for i in rng.permutation(len(local)):
+                pos, vals = local[i]
+                logits = vals @ weights[pos] + bias
+                logits -= logits.max()
+                probs = np.exp(logits)
+                probs /= probs.sum()
+                probs[targets[i]] -= 1.0
+
+                weights[pos] -= lr * (np.outer(vals, probs) + l2 * weights[pos])
+                bias -= lr * probs
+
+        return cls(rows, weights, bias, labels)
+
+    # =========================================================
+    # ARTIFACT
+    # =========================================================
+
+    def save(self, path: str = DEFAULT_MODEL_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        np.savez_compressed(
+            path,
+            rows=self.rows.astype(np.int32),
+            weights=self.weights.astype(np.float16),
+            bias=self.bias,
+            labels=np.array(self.labels),
+        )
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_MODEL_PATH, **kwargs) -> Optional["FastIntentClassifier"]:
+        if not os.path.exists(path):
+            return None
+        try:
+            with np.load(path) as data:
+                return cls(data["rows"], data["weights"], data["bias"], data["labels"].tolist(), **kwargs)
+        except Exception as e:
+            print(f"⚠️ [FAST CLASSIFIER]: Could not load {path}: {e}")
+            return None
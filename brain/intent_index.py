@@ -0,0 +1,74 @@
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+
+from .vector_store import CompactVectorStore, _normalize_rows
+
+
+class IntentIndex:
+    """
+    Stacked phrase-embedding matrix for IntentJudge.
+
+    Every intent phrase is one pre-normalized row. Rows are grouped by intent
+    so scoring is a single matrix product followed by a segmented max. Rows
+    live in a CompactVectorStore (float32 / float16 / int8, optional PCA).
+    """
+
+    def __init__(self, matrix: np.ndarray, intent_names: List[str], counts: List[int], normalized: bool = False,
+                 storage: str = "float32", pca_dim: Optional[int] = None):
+        self.intent_names = list(intent_names)
+
+        # Pre-normalized (e.g. memory-mapped cache) rows are used as-is, without a copy
+        matrix = np.asarray(matrix, dtype=np.float32)
+        self.store = CompactVectorStore(
+            matrix if normalized else _normalize_rows(matrix),
+            storage=storage,
+            pca_dim=pca_dim
+        )
+
+        # Row → intent position, and the first row of each intent segment
+        self.phrase_intent_idx = np.repeat(np.arange(len(counts)), counts)
+        self.segment_starts = np.concatenate(([0], np.cumsum(counts)[:-1])).astype(np.intp)
+
+    @classmethod
+    def from_embeddings(cls, intent_embeddings: Dict[str, np.ndarray]) -> "IntentIndex":
+        names, blocks, counts = [], [], []
+        for intent, emb in intent_embeddings.items():
+            emb = np.atleast_2d(np.asarray(emb, dtype=np.float32))
+            if emb.shape[0] == 0:
+                continue  # reduceat cannot express an empty segment
+            names.append(intent)
+            blocks.append(emb)
+            counts.append(emb.shape[0])
+
+        if not blocks:
+            raise ValueError("IntentIndex needs at least one intent with phrases.")
+
+        return cls(np.vstack(blocks), names, counts)
+
+    def __len__(self):
+        return len(self.intent_names)
+
+    # =========================================================
+    # SCORING
+    # =========================================================
+
+    def score(self, query: np.ndarray) -> np.ndarray:
+        """Best cosine similarity per intent for one query vector."""
+        return self.score_batch(query)[0]
+
+    def score_batch(self, queries: np.ndarray) -> np.ndarray:
+        """(batch, intents) best similarities for a stack of query vectors."""
+        sims = self.store.scores_batch(queries)
+        return np.maximum.reduceat(sims, self.segment_starts, axis=1)
+
+    def rank(self, query: np.ndarray) -> List[Tuple[str, float]]:
+        """(intent, score) pairs, best first."""
+        return self._ranked(self.score(query))
+
+    def rank_batch(self, queries: np.ndarray) -> List[List[Tuple[str, float]]]:
+        return [self._ranked(row) for row in self.score_batch(queries)]
+
+    def _ranked(self, scores: np.ndarray) -> List[Tuple[str, float]]:
+        order = np.argsort(-scores, kind="stable")
+        return [(self.intent_names[i], float(scores[i])) for i in order]
+
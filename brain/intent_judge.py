@@ -1,33 +1,91 @@
 import json
 import os
+import re
+import threading
+import time
+import numpy as np
 from flashtext import KeywordProcessor
-from sentence_transformers import SentenceTransformer, util
-import torch
+
+from .embedding_cache import EmbeddingCache
+from .intent_index import IntentIndex
+from .lru_cache import LRUCache
+from .onnx_encoder import DEFAULT_ONNX_DIR, OnnxEncoder
+from .skill_bridge import SkillBridge
 
 
 class IntentJudge:
-    def __init__(self, skill_manager=None, config_path="core/custom_commands.json"):
+    def __init__(self, skill_manager=None, config_path="core/custom_commands.json", background=False, backend=None):
         self.MODEL_NAME = "all-MiniLM-L6-v2"
+        # "torch" (SentenceTransformer) or "onnx" (quantized ONNX Runtime, no torch import)
+        self.BACKEND = (backend or os.getenv("CRYSTAL_EMBED_BACKEND", "torch")).lower()
+        self.ONNX_DIR = os.getenv("CRYSTAL_ONNX_DIR", DEFAULT_ONNX_DIR)
         self.HIGH_CONFIDENCE = 0.65
         self.MEDIUM_CONFIDENCE = 0.45
         self.AMBIGUITY_MARGIN = 0.07
         self.config_path = config_path
+        self.ROUTE_CACHE_SIZE = 512
+        # Compact phrase storage: float32 | float16 | int8, optional PCA dimension
+        self.EMBED_STORAGE = os.getenv("CRYSTAL_EMBED_STORAGE", "float32").lower()
+        self.EMBED_PCA_DIM = int(os.getenv("CRYSTAL_EMBED_PCA_DIM", "0")) or None
+        self.skill_manager = skill_manager
 
-        print(f"🧠 [JUDGE]: Initializing Semantic Engine ({self.MODEL_NAME})...")
-        self.model = SentenceTransformer(self.MODEL_NAME)
-
-        # Load intents
-        self.intents, self.imperative_verbs = self._load_data()
+        # Load intents (string values are LearnCommandSkill trigger → response pairs)
+        data, self.imperative_verbs = self._load_data()
+        self.intents, self.learned_commands = self._split_learned(data)
 
-        print(f"⚡ [JUDGE]: Precomputing embeddings for {len(self.intents)} intents...")
-        self.intent_embeddings = {
-            intent: self.model.encode(phrases, convert_to_tensor=True)
-            for intent, phrases in self.intents.items()
-        }
+        # Calibrated per-intent thresholds (fall back to the globals above)
+        self.thresholds_path = os.path.splitext(config_path)[0] + ".thresholds.json"
+        self.intent_thresholds = self._load_thresholds()
 
-        # Keyword gate
+        # Keyword gate + SkillBridge scorer serve requests until the model is up
         self.keyword_processor = KeywordProcessor(case_sensitive=False)
+        self.keyword_intents = {}
         self._setup_keyword_gate()
+        self.skill_bridge = SkillBridge(skill_manager) if skill_manager else None
+
+        self.model = None
+        self.index = None
+        self.index_version = 0
+        self.route_cache = LRUCache(maxsize=self.ROUTE_CACHE_SIZE)
+        self.embedding_cache = None  # named after the loaded encoder, see _load_semantic_engine
+        self.ready = threading.Event()
+        self.load_error = None
+
+        # Hot reload: index swaps happen under _index_lock, rebuilds under _reload_lock
+        self._index_lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+        self._watcher = None
+
+        if background:
+            threading.Thread(target=self._load_semantic_engine, daemon=True).start()
+        else:
+            self._load_semantic_engine()
+
+    @property
+    def is_ready(self) -> bool:
+        return self.ready.is_set()
+
+    # =========================================================
+    # SEMANTIC ENGINE
+    # =========================================================
+
+    def _load_semantic_engine(self):
+        started = time.perf_counter()
+        try:
+            print(f"🧠 [JUDGE]: Initializing Semantic Engine ({self.MODEL_NAME}, {self.BACKEND})...")
+            self.model = self._load_encoder()
+            self.embedding_cache = EmbeddingCache(self._cache_name())
+
+            with self._reload_lock:
+                print(f"⚡ [JUDGE]: Precomputing embeddings for {len(self.intents)} intents...")
+                self._set_index(self._build_index(self.intents))
+        except Exception as e:
+            self.load_error = e
+            print(f"❌ [JUDGE]: Semantic engine failed, staying on keyword routing: {e}")
+            return
+
+        self.ready.set()
+        print(f"✅ [JUDGE]: Semantic routing online ({time.perf_counter() - started:.1f}s).")
 
     # =========================================================
     # DATA LOADING
@@ -68,57 +126,320 @@ class IntentJudge:
 
         return default_intents, default_verbs
 
+    def _load_encoder(self):
+        if self.BACKEND == "onnx":
+            return OnnxEncoder(self.ONNX_DIR)
+
+        from sentence_transformers import SentenceTransformer
+        return SentenceTransformer(self.MODEL_NAME)
+
+    def _cache_name(self) -> str:
+        # Vectors differ per backend and per ONNX export (int8 vs full), so each gets its own cache
+        model_file = getattr(self.model, "model_file", None)
+        if model_file is None:
+            return self.MODEL_NAME
+        return f"{self.MODEL_NAME}-onnx-{os.path.splitext(model_file)[0]}"
+
+    def _split_learned(self, data):
+        intents = {k: v for k, v in data.items() if not isinstance(v, str)}
+        learned = {self.normalize(k): v for k, v in data.items() if isinstance(v, str)}
+        return intents, learned
+
+    # =========================================================
+    # HOT RELOAD
+    # =========================================================
+
+    def start_watcher(self, interval: float = 1.0):
+        """Polls the command file and hot-reloads it when it changes."""
+        if self._watcher:
+            return
+        self._watch_stamp = self._file_stamp()
+        self._watcher = threading.Thread(target=self._watch_loop, args=(interval,), daemon=True)
+        self._watcher.start()
+
+    def _file_stamp(self):
+        stamps = []
+        for path in (self.config_path, self.thresholds_path):
+            try:
+                st = os.stat(path)
+                stamps.append((st.st_mtime_ns, st.st_size))
+            except OSError:
+                stamps.append(None)
+        return tuple(stamps)
+
+    def _watch_loop(self, interval: float):
+        while True:
+            time.sleep(interval)
+            stamp = self._file_stamp()
+            if stamp != self._watch_stamp:
+                # A half-written file fails to parse; the writer's next flush changes the stamp again
+                self._watch_stamp = stamp
+                try:
+                    self.reload()
+                except Exception as e:
+                    # Keep watching: the next edit may fix whatever broke this one
+                    print(f"❌ [JUDGE]: Reload failed, keeping the current commands: {e}")
+
+    def reload(self) -> bool:
+        """
+        Re-reads the command file. Only added or changed phrases are embedded,
+        the keyword gate is patched in place, and the new index replaces the old
+        one in a single swap so in-flight requests never see a half-built state.
+        """
+        started = time.perf_counter()
+        with self._reload_lock:
+            try:
+                data, verbs = self._load_data()
+            except (ValueError, OSError) as e:
+                print(f"⚠️ [JUDGE]: Reload skipped, could not read {self.config_path}: {e}")
+                return False
+
+            intents, learned = self._split_learned(data)
+            thresholds = self._load_thresholds()
+            old_phrases = _phrase_pairs(self.intents)
+            new_phrases = _phrase_pairs(intents)
+
+            index = None
+            if self.model is not None and new_phrases != old_phrases:
+                if new_phrases:
+                    index = self._build_index(intents)
+                else:
+                    # An empty index cannot score anything; route on the last good one
+                    print(f"⚠️ [JUDGE]: {self.config_path} has no intent phrases, keeping the previous index")
+
+            if index is None and thresholds != self.intent_thresholds:
+                index = self.index  # same vectors, but cached decisions are stale
+
+            added_kw, removed_kw = self._update_keyword_gate(intents, verbs)
+            self.intents, self.imperative_verbs, self.learned_commands = intents, verbs, learned
+            self.intent_thresholds = thresholds
+            if index is not None:
+                self._set_index(index)
+                if not self.ready.is_set():
+                    # The engine started with nothing to index; this reload brought it online
+                    self.load_error = None
+                    self.ready.set()
+                    print("✅ [JUDGE]: Semantic routing online (first phrases loaded).")
+
+        print(
+            f"♻️ [JUDGE]: Reloaded commands in {(time.perf_counter() - started) * 1000:.1f} ms "
+            f"(+{len(new_phrases - old_phrases)}/-{len(old_phrases - new_phrases)} phrases, "
+            f"+{added_kw}/-{removed_kw} keywords, {len(learned)} learned)"
+        )
+        return True
+
+    # =========================================================
+    # EMBEDDING INDEX
+    # =========================================================
+
+    def _build_index(self, intents) -> IntentIndex:
+        names, counts, phrases = [], [], []
+        for intent, intent_phrases in intents.items():
+            intent_phrases = _as_phrases(intent_phrases)
+            if not intent_phrases:
+                continue
+            names.append(intent)
+            counts.append(len(intent_phrases))
+            phrases.extend(intent_phrases)
+
+        if not phrases:
+            raise ValueError("IntentIndex needs at least one intent with phrases.")
+
+        # Only new or changed phrases hit the model; the rest are mapped from disk
+        matrix = self.embedding_cache.get_or_encode(phrases, self._encode_phrases)
+        return IntentIndex(
+            matrix, names, counts,
+            normalized=True,
+            storage=self.EMBED_STORAGE,
+            pca_dim=self.EMBED_PCA_DIM
+        )
+
+    def _set_index(self, index: IntentIndex):
+        # Cached routing decisions carry the version they were made against
+        with self._index_lock:
+            self.index = index
+            self.index_version += 1
+
+    def _encode_phrases(self, phrases):
+        return self.model.encode(phrases, normalize_embeddings=True, convert_to_numpy=True)
+
     # =========================================================
     # KEYWORD GATE
     # =========================================================
 
     def _setup_keyword_gate(self):
-        for phrases in self.intents.values():
-            for phrase in phrases:
-                if len(phrase.split()) <= 2:
-                    self.keyword_processor.add_keyword(phrase)
+        self.keyword_intents = self._keyword_table(self.intents)
+        for phrase in self.keyword_intents:
+            self.keyword_processor.add_keyword(phrase)
 
         for verb in self.imperative_verbs:
             self.keyword_processor.add_keyword(verb)
 
+    @staticmethod
+    def _keyword_table(intents):
+        table = {}
+        for intent, phrases in intents.items():
+            for phrase in _as_phrases(phrases):
+                if len(phrase.split()) <= 2:
+                    table.setdefault(phrase.lower(), set()).add(intent)
+        return table
+
+    def _update_keyword_gate(self, intents, verbs):
+        """Adds/removes only the keywords that changed; returns (added, removed)."""
+        table = self._keyword_table(intents)
+        old = set(self.keyword_intents) | {v.lower() for v in self.imperative_verbs}
+        new = set(table) | {v.lower() for v in verbs}
+
+        for kw in new - old:
+            self.keyword_processor.add_keyword(kw)
+        for kw in old - new:
+            self.keyword_processor.remove_keyword(kw)
+
+        self.keyword_intents = table
+        return len(new - old), len(old - new)
+
+    def keyword_hits(self, text: str):
+        """Intents whose short phrases appear in the text (imperative verbs excluded)."""
+        keywords = self.keyword_processor.extract_keywords(text)
+        return sorted({
+            intent
+            for kw in keywords
+            for intent in self.keyword_intents.get(kw.lower(), ())
+        })
+
+    def skill_bridge_intent(self, text: str, strict: bool = False):
+        """SkillBridge's pick as an intent; strict=True only for a single unambiguous strong hit."""
+        if not self.skill_bridge:
+            return None
+        if strict:
+            return self.intent_for_skill(self.skill_bridge.strong_match(text))
+        return self.intent_for_skill(self.skill_bridge._find_skill_by_keywords(text))
+
+    def _keyword_route(self, text: str):
+        """Routing used while the semantic model is still loading."""
+        hits = self.keyword_hits(text)
+        print(f"🧠 [JUDGE]: Keyword routing → {hits}")
+
+        if len(hits) == 1:
+            return {"action": "execute", "intent": hits[0], "confidence": self.HIGH_CONFIDENCE}
+
+        if self.skill_bridge:
+            intent = self.skill_bridge_intent(text)
+            if intent:
+                return {"action": "execute", "intent": intent, "confidence": self.HIGH_CONFIDENCE}
+
+        if hits:
+            return {
+                "action": "clarify",
+                "intent": hits[0],
+                "confidence": self.MEDIUM_CONFIDENCE,
+                "candidates": hits
+            }
+
+        return {"action": "none"}
+
+    def intent_for_skill(self, skill_name):
+        if not skill_name or not self.skill_manager:
+            return None
+        for s in self.skill_manager.skills:
+            if s["name"] == skill_name and s["supported_intents"]:
+                return s["supported_intents"][0].lower()
+        return None
+
     # =========================================================
     # INTENT DETECTION
     # =========================================================
 
     def detect_intent(self, text: str):
-        text = text.lower().strip()
+        return self.detect_intents([text])[0]
 
-        if not text:
-            return {"action": "none"}
+    def detect_intents(self, texts):
+        """
+        Routes several utterances at once: cache misses are encoded in one
+        forward pass and scored with one matrix product. Returns one
+        detect_intent-style dict per input, in order.
+        """
+        results = [None] * len(texts)
+        pending = {}
 
-        print(f"\n🧠 [JUDGE]: Analyzing → {text}")
+        for i, raw in enumerate(texts):
+            text = raw.lower().strip()
 
-        # 1️⃣ KEYWORD CHECK (Speed Boost, Not Hard Block)
-        keywords = self.keyword_processor.extract_keywords(text)
-        first_word = text.split()[0] if text.split() else ""
+            if not text:
+                results[i] = {"action": "none"}
+                continue
+
+            if not self.is_ready:
+                results[i] = self._keyword_route(text)
+                continue
 
-        print(f"🧠 [JUDGE]: Keywords → {keywords}")
+            # 0️⃣ ROUTE CACHE (repeated short commands skip the model entirely)
+            key = self.normalize(text)
+            if key in pending:
+                pending[key]["slots"].append(i)
+                continue
 
-        # 2️⃣ SEMANTIC EVALUATION
-        text_emb = self.model.encode(text, convert_to_tensor=True)
+            cached = self.route_cache.get(key)
+            if cached and cached["version"] == self.index_version:
+                print(f"🧠 [JUDGE]: Cache hit → {key}")
+                results[i] = _copy_decision(cached["decision"])
+                continue
+            if cached:
+                # Decided against an older index: not a hit
+                self.route_cache.miss()
 
-        scores = []
-        for intent, emb in self.intent_embeddings.items():
-            score = util.cos_sim(text_emb, emb).max().item()
-            scores.append((intent, score))
+            print(f"\n🧠 [JUDGE]: Analyzing → {text}")
+
+            # 1️⃣ KEYWORD CHECK (Speed Boost, Not Hard Block)
+            keywords = self.keyword_processor.extract_keywords(text)
+            print(f"🧠 [JUDGE]: Keywords → {keywords}")
+
+            # Embedding survives an intent-set change
+            pending[key] = {
+                "slots": [i],
+                "text": text,
+                "embedding": cached["embedding"] if cached else None,
+            }
 
-        scores.sort(key=lambda x: x[1], reverse=True)
+        if not pending:
+            return results
 
+        # 2️⃣ SEMANTIC EVALUATION (one batch encode, one matmul)
+        to_encode = [p for p in pending.values() if p["embedding"] is None]
+        if to_encode:
+            embeddings = self.model.encode(
+                [p["text"] for p in to_encode],
+                normalize_embeddings=True,
+                convert_to_numpy=True
+            )
+            for p, emb in zip(to_encode, embeddings):
+                p["embedding"] = emb
+
+        with self._index_lock:
+            index, version = self.index, self.index_version
+        ranked = index.rank_batch(np.vstack([p["embedding"] for p in pending.values()]))
+
+        for key, p, scores in zip(pending.keys(), pending.values(), ranked):
+            decision = self._decide(scores)
+            self.route_cache.put(key, {
+                "embedding": p["embedding"],
+                "decision": decision,
+                "version": version,
+            })
+            for slot in p["slots"]:
+                results[slot] = _copy_decision(decision)
+
+        return results
+
+    def _decide(self, scores):
         top_intent, top_score = scores[0]
         print(f"🧠 [JUDGE]: Top Intent → {top_intent} ({top_score:.3f})")
 
-        # 3️⃣ Ambiguity Detection
-        close_matches = [
-            intent for intent, score in scores[1:]
-            if abs(top_score - score) <= self.AMBIGUITY_MARGIN
-        ]
+        high, medium, margin = self.thresholds_for(top_intent)
+        action, close_matches = decide_action(scores, high, medium, margin)
 
-        if close_matches and top_score >= self.MEDIUM_CONFIDENCE:
+        # 3️⃣ Ambiguity Detection
+        if action == "clarify":
             print("🧠 [JUDGE]: Ambiguous match detected.")
             return {
                 "action": "clarify",
@@ -128,7 +449,7 @@ class IntentJudge:
             }
 
         # 4️⃣ Final Routing
-        if top_score >= self.HIGH_CONFIDENCE:
+        if action == "execute":
             print("🧠 [JUDGE]: High confidence execution.")
             return {
                 "action": "execute",
@@ -136,7 +457,7 @@ class IntentJudge:
                 "confidence": round(top_score, 3)
             }
 
-        if top_score >= self.MEDIUM_CONFIDENCE:
+        if action == "confirm":
             print("🧠 [JUDGE]: Medium confidence — confirmation required.")
             return {
                 "action": "confirm",
@@ -146,3 +467,74 @@ class IntentJudge:
 
         print("🧠 [JUDGE]: No suitable intent.")
         return {"action": "none"}
+
+    # =========================================================
+    # THRESHOLDS
+    # =========================================================
+
+    def thresholds_for(self, intent: str):
+        """(high, medium, margin) — calibrated per intent when available."""
+        t = self.intent_thresholds.get(intent, {})
+        return (
+            t.get("high", self.HIGH_CONFIDENCE),
+            t.get("medium", self.MEDIUM_CONFIDENCE),
+            t.get("margin", self.AMBIGUITY_MARGIN),
+        )
+
+    def _load_thresholds(self):
+        """Per-intent thresholds written by calibrate_thresholds.py next to the intent file."""
+        if not os.path.exists(self.thresholds_path):
+            return {}
+        try:
+            with open(self.thresholds_path, "r") as f:
+                return json.load(f).get("intents", {})
+        except (ValueError, OSError) as e:
+            print(f"⚠️ [JUDGE]: Ignoring thresholds file: {e}")
+            return {}
+
+    # =========================================================
+    # ROUTE CACHE
+    # =========================================================
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Cache key: lowercase, collapsed whitespace, no trailing punctuation."""
+        return re.sub(r"\s+", " ", text.lower()).strip(" ?!.,")
+
+    def cache_stats(self) -> dict:
+        return self.route_cache.stats()
+
+
+def decide_action(scores, high, medium, margin):
+    """
+    Routing rule shared by IntentJudge and the threshold calibrator.
+    Returns (action, close_matches) for ranked (intent, score) pairs.
+    """
+    top_score = scores[0][1]
+    close_matches = [
+        intent for intent, score in scores[1:]
+        if abs(top_score - score) <= margin
+    ]
+
+    if close_matches and top_score >= medium:
+        return "clarify", close_matches
+    if top_score >= high:
+        return "execute", []
+    if top_score >= medium:
+        return "confirm", []
+    return "none", []
+
+
+def _phrase_pairs(intents):
+    return {(intent, phrase) for intent, phrases in intents.items() for phrase in _as_phrases(phrases)}
+
+
+def _as_phrases(value):
+    return [value] if isinstance(value, str) else list(value or [])
+
+
+def _copy_decision(decision: dict) -> dict:
+    copied = dict(decision)
+    if "candidates" in copied:
+        copied["candidates"] = list(copied["candidates"])
+    return copied
@@ -0,0 +1,131 @@
+import json
+from typing import Any, Optional
+
+_CLOSERS = {"{": "}", "[": "]"}
+
+
+class JSONExtractor:
+    """
+    Incremental, tolerant JSON reader for LLM output.
+
+    feed() text as it arrives (whole or in streamed chunks); the scanner keeps
+    its bracket/string state between calls, so nothing is rescanned. Leading
+    prose and ``` fences before the first { or [ are skipped, and anything
+    after the first complete value is ignored.
+
+    value() returns the parsed value so far: the complete value once closed,
+    otherwise the prefix repaired by closing the open string and brackets,
+    or failing that, cut back to the last complete element and closed
+    (None if nothing usable yet). value(partial=False) only returns a
+    value the text closed itself: a cut-off one is None, never repaired.
+    """
+
+    def __init__(self):
+        self.buffer = []
+        self.stack = []
+        self.started = False
+        self.complete = False
+        self.in_string = False
+        self.escape = False
+        # Buffer length at the end of the last complete element (safe cut point)
+        self._last_safe = 0
+
+    def feed(self, chunk: str) -> "JSONExtractor":
+        for ch in chunk:
+            if self.complete:
+                break
+            if not self.started:
+                if ch in _CLOSERS:
+                    self.started = True
+                else:
+                    continue
+            self._scan(ch)
+        return self
+
+    def _scan(self, ch: str):
+        self.buffer.append(ch)
+
+        if self.in_string:
+            if self.escape:
+                self.escape = False
+            elif ch == "\\":
+                self.escape = True
+            elif ch == '"':
+                self.in_string = False
+            return
+
+        if ch == '"':
+            self.in_string = True
+        elif ch == ",":
+            self._last_safe = len(self.buffer) - 1
+        elif ch in _CLOSERS:
+            self.stack.append(_CLOSERS[ch])
+        elif ch in "}]":
+            if self.stack and self.stack[-1] == ch:
+                self.stack.pop()
+                self._last_safe = len(self.buffer)
+            if not self.stack:
+                self.complete = True
+
+    def value(self, partial: bool = True) -> Optional[Any]:
+        if not self.started:
+            return None
+
+        text = "".join(self.buffer)
+        if self.complete:
+            try:
+                return json.loads(text)
+            except ValueError:
+                return None
+
+        if not partial:
+            return None
+
+        for candidate in (self._close(text, self.in_string), self._close(text[:self._last_safe], False)):
+            try:
+                return json.loads(candidate)
+            except ValueError:
+                continue
+        return None
+
+    def _close(self, text: str, in_string: bool) -> str:
+        if in_string:
+            text += '"'
+        text = self._trim(text)
+        stack = _open_brackets(text)
+        return text + "".join(reversed(stack))
+
+    @staticmethod
+    def _trim(text: str) -> str:
+        # A dangling separator can't be closed into valid JSON
+        text = text.rstrip()
+        while text and text[-1] in ",:":
+            text = text[:-1].rstrip()
+        return text
+
+
+def _open_brackets(text: str):
+    stack, in_string, escape = [], False, False
+    for ch in text:
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in _CLOSERS:
+            stack.append(_CLOSERS[ch])
+        elif ch in "}]" and stack:
+            stack.pop()
+    return stack
+
+
+def extract_json(text: str, partial: bool = True) -> Optional[Any]:
+    """
+    First JSON value in `text`, repaired if it was cut off; None if there is none.
+    partial=False returns None for cut-off text instead of repairing it.
+    """
+    return JSONExtractor().feed(text or "").value(partial)
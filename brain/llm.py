@@ -1,18 +1,87 @@
 import requests
-import datetime
-import psutil
+import json
 import os
-from typing import Any
+import threading
+import time
+from collections import deque
+from typing import Any, Iterator, Optional
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .context_providers import DEFAULT_LOCATION, providers, register_defaults
+from .llm_backends import BackendPool, is_backend_failure
+from .llm_cache import ResponseCache
+from .llm_scheduler import LLMScheduler
 
 load_dotenv()
 
 # ==========================
 # CONFIGURATION
 # ==========================
-OLLAMA_URL = "http://localhost:11434/api/chat"
+# Point at another server (e.g. python -m brain.mock_ollama) with CRYSTAL_OLLAMA_URL
+OLLAMA_URL = os.getenv("CRYSTAL_OLLAMA_URL", "http://localhost:11434/api/chat")
+
+# Several Ollama hosts (comma-separated, e.g. "http://gpu1:11434,http://gpu2:11434");
+# empty = OLLAMA_URL only. CRYSTAL_LLM_BALANCE: least_outstanding | latency
+OLLAMA_HOSTS = [h.strip() for h in os.getenv("CRYSTAL_OLLAMA_HOSTS", "").split(",") if h.strip()]
+BALANCE_STRATEGY = os.getenv("CRYSTAL_LLM_BALANCE", "least_outstanding")
 MODEL_NAME = "crystal"
 
+# Model registry: profiles pick a tier, the tier names an Ollama model.
+# Keeping both resident needs OLLAMA_MAX_LOADED_MODELS >= 2 on the server.
+MODELS = {
+    "large": os.getenv("CRYSTAL_LARGE_MODEL", MODEL_NAME),
+    "small": os.getenv("CRYSTAL_SMALL_MODEL", "") or os.getenv("CRYSTAL_LARGE_MODEL", MODEL_NAME),
+}
+
+# HTTP client: one pooled keep-alive session shared by every LLM call
+POOL_SIZE = int(os.getenv("CRYSTAL_LLM_POOL_SIZE", "8"))
+CONNECT_TIMEOUT = float(os.getenv("CRYSTAL_LLM_CONNECT_TIMEOUT", "3"))
+READ_TIMEOUT = float(os.getenv("CRYSTAL_LLM_READ_TIMEOUT", "120"))
+MAX_RETRIES = int(os.getenv("CRYSTAL_LLM_RETRIES", "2"))
+
+# Requests run at once per Ollama host (match OLLAMA_NUM_PARALLEL); the rest queue by priority
+MAX_IN_FLIGHT = int(os.getenv("CRYSTAL_LLM_MAX_IN_FLIGHT", "2"))
+
+# Response cache: only calls at or below CACHE_MAX_TEMPERATURE are deterministic enough
+CACHE_ENABLED = os.getenv("CRYSTAL_LLM_CACHE", "1") != "0"
+CACHE_MAX_TEMPERATURE = float(os.getenv("CRYSTAL_LLM_CACHE_MAX_TEMP", "0.1"))
+CACHE_SIZE = int(os.getenv("CRYSTAL_LLM_CACHE_SIZE", "256"))
+CACHE_TTL = float(os.getenv("CRYSTAL_LLM_CACHE_TTL", "3600"))
+CACHE_DB = os.getenv("CRYSTAL_LLM_CACHE_DB", "")  # e.g. core/llm_cache.db; empty = memory only
+
+# Context window sent as num_ctx, and the share of it reserved for the reply
+NUM_CTX = int(os.getenv("CRYSTAL_NUM_CTX", "4096"))
+NUM_PREDICT = int(os.getenv("CRYSTAL_NUM_PREDICT", "512"))
+
+# How long Ollama keeps the model (and its KV cache) loaded after a call; "" = server default
+KEEP_ALIVE = os.getenv("CRYSTAL_LLM_KEEP_ALIVE", "30m")
+
+# Generation profiles: sampling, reply cap and output constraints per kind of call.
+# scale_with_input: num_predict follows the size of the last user message (up to the cap),
+# since an extraction cannot be much longer than what it extracts from. Only for short fields;
+# free text the user dictated (an email body) uses "compose", which keeps the full budget.
+# priority: default scheduler class (llm_scheduler.PRIORITIES) when the caller names none.
+GENERATION_PROFILES = {
+    "chat": {"model": "large", "temperature": 0.85, "num_predict": NUM_PREDICT, "priority": "interactive"},
+    "classify": {"model": "small", "temperature": 0.0, "num_predict": 12, "stop": ["\n"], "priority": "skill"},
+    "extract": {"model": "small", "temperature": 0.0, "num_predict": 160, "stop": ["\n\n"], "scale_with_input": True,
+                "priority": "skill"},
+    "compose": {"model": "small", "temperature": 0.0, "num_predict": NUM_PREDICT, "priority": "skill"},
+    "plan": {"model": "small", "temperature": 0.1, "num_predict": 384, "format": "json", "priority": "agent"},
+}
+
+# run_llm task types → profile
+TASK_PROFILES = {
+    "conversation": "chat",
+    "classify": "classify",
+    "skill_routing": "classify",
+    "extract": "extract",
+    "compose": "compose",
+    "plan": "plan",
+}
+
 # This prompt is engineered to maximize instruction adherence and bypass refusals.
 SYSTEM_CLEAN = {
     "role": "system",
@@ -26,80 +95,501 @@ SYSTEM_CLEAN = {
     )
 }
 
-def get_dynamic_context():
-    """Provides real-time system/location data for the model."""
-    now = datetime.datetime.now().strftime("%I:%M %p, %A, %B %d, %Y")
-    battery = psutil.sensors_battery()
-    bat = f"{battery.percent}%" if battery else "Unknown"
-    charging = "charging" if battery and battery.power_plugged else "not charging"
-    
-    # Static location for Nairobi
-    city = "Nairobi, Kenya"
+_session = None
+_session_lock = threading.Lock()
+
+_cache = ResponseCache(CACHE_SIZE, CACHE_TTL, CACHE_DB or None) if CACHE_ENABLED else None
 
-    return f"Context [Time: {now} | Location: {city} | Battery: {bat}, {charging}]. Use this for silent background context."
 
-def generate_response(messages: Any, system_prompt: str = "", temperature: float = 0.85) -> str:
+class PrefillStats:
     """
-    Generates a conversational response.
-    Temperature is set high (0.85) to encourage creative compliance over robotic refusal.
+    Prompt-eval accounting from Ollama's response stats.
+
+    Ollama only evaluates the part of the prompt after the longest prefix it
+    still has in its KV cache, so prompt_eval_count drops when the prefix is
+    reused. Reused tokens are estimated as the prompt size (chars / 4) minus
+    prompt_eval_count, and the time saved as reused tokens at the running
+    per-token prefill rate. The rate is only learned from prefills of at
+    least RATE_MIN_TOKENS, since tiny ones are dominated by fixed overhead.
     """
+
+    RATE_MIN_TOKENS = 32
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.ms_per_token = None
+        self.requests = 0
+        self.prompt_tokens = 0
+        self.evaluated_tokens = 0
+        self.prefill_ms = 0.0
+        self.saved_ms = 0.0
+        self.last = {}
+
+    def record(self, payload: dict, data: dict):
+        evaluated = data.get("prompt_eval_count")
+        duration_ns = data.get("prompt_eval_duration")
+        if not evaluated or duration_ns is None:
+            return
+
+        prompt_chars = sum(len(m.get("content", "")) for m in payload["messages"])
+        prompt_tokens = max(prompt_chars // 4, evaluated)
+        prefill_ms = duration_ns / 1e6
+
+        with self._lock:
+            if evaluated >= self.RATE_MIN_TOKENS:
+                rate = prefill_ms / evaluated
+                self.ms_per_token = rate if self.ms_per_token is None else 0.8 * self.ms_per_token + 0.2 * rate
+            saved_ms = (prompt_tokens - evaluated) * (self.ms_per_token or 0.0)
+
+            self.requests += 1
+            self.prompt_tokens += prompt_tokens
+            self.evaluated_tokens += evaluated
+            self.prefill_ms += prefill_ms
+            self.saved_ms += saved_ms
+            self.last = {
+                "prompt_tokens_est": prompt_tokens,
+                "evaluated_tokens": evaluated,
+                "prefill_ms": round(prefill_ms, 1),
+                "saved_ms_est": round(saved_ms, 1),
+            }
+
+    def stats(self) -> dict:
+        with self._lock:
+            n = self.requests
+            return {
+                "requests": n,
+                "reuse_ratio": round(1 - self.evaluated_tokens / self.prompt_tokens, 3) if self.prompt_tokens else 0.0,
+                "ms_per_token": round(self.ms_per_token, 3) if self.ms_per_token else None,
+                "avg_prefill_ms": round(self.prefill_ms / n, 1) if n else 0.0,
+                "avg_saved_ms_est": round(self.saved_ms / n, 1) if n else 0.0,
+                "total_saved_ms_est": round(self.saved_ms, 1),
+                "last": dict(self.last),
+            }
+
+
+_prefill = PrefillStats()
+
+
+class ModelStats:
+    """Per-model request count, error count and latency percentiles (last `window` calls)."""
+
+    def __init__(self, window: int = 256):
+        self.window = window
+        self._lock = threading.Lock()
+        self._models = {}
+
+    def record(self, model: str, elapsed_ms: float, ok: bool = True):
+        with self._lock:
+            m = self._models.setdefault(model, {"requests": 0, "errors": 0, "samples": deque(maxlen=self.window)})
+            m["requests"] += 1
+            m["errors"] += int(not ok)
+            if ok:
+                m["samples"].append(elapsed_ms)
+
+    def stats(self) -> dict:
+        with self._lock:
+            report = {}
+            for model, m in self._models.items():
+                lat = sorted(m["samples"])
+                pick = lambda q: round(lat[min(int(q * len(lat)), len(lat) - 1)], 1) if lat else 0.0
+                report[model] = {
+                    "requests": m["requests"],
+                    "errors": m["errors"],
+                    "p50_ms": pick(0.5),
+                    "p95_ms": pick(0.95),
+                    "mean_ms": round(sum(lat) / len(lat), 1) if lat else 0.0,
+                }
+            return report
+
+
+_model_stats = ModelStats()
+
+def get_session() -> requests.Session:
+    """
+    Module-wide pooled session (keep-alive, bounded retry).
+    Retries cover refused connections and 502/503/504 only; a read timeout is
+    not retried because the model may already have generated. With several
+    hosts there are no same-host retries: ChatAttempts fails over instead.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                retries = 0 if len(OLLAMA_HOSTS) > 1 else MAX_RETRIES
+                retry = Retry(
+                    total=retries,
+                    connect=retries,
+                    read=0,
+                    status=retries,
+                    backoff_factor=0.3,
+                    status_forcelist=(502, 503, 504),
+                    allowed_methods=frozenset({"GET", "POST"}),
+                    raise_on_status=False,
+                )
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=POOL_SIZE, max_retries=retry)
+                session = requests.Session()
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _session = session
+    return _session
+
+_pool = None
+_pool_urls = None
+_pool_lock = threading.Lock()
+_scheduler = LLMScheduler(MAX_IN_FLIGHT * max(len(OLLAMA_HOSTS), 1))
+
+def _chat_url(host: str) -> str:
+    if "://" not in host:
+        host = f"http://{host}"
+    return host if host.rstrip("/").endswith("/api/chat") else f"{host.rstrip('/')}/api/chat"
+
+def get_backend_pool() -> BackendPool:
+    """Pool over OLLAMA_HOSTS (or just OLLAMA_URL); rebuilt if OLLAMA_URL is repointed."""
+    global _pool, _pool_urls
+    urls = [_chat_url(h) for h in OLLAMA_HOSTS] or [OLLAMA_URL]
+    if _pool is None or urls != _pool_urls:
+        with _pool_lock:
+            if _pool is None or urls != _pool_urls:
+                _pool = BackendPool(urls, strategy=BALANCE_STRATEGY)
+                _pool_urls = urls
+                _scheduler.max_concurrent = MAX_IN_FLIGHT * len(urls)
+                _pool.start_health_checks()
+    return _pool
+
+def get_dynamic_context():
+    """
+    Provides real-time system/location data for the model.
+    Reads the background-sampled snapshot (brain/context_providers.py); no sensor I/O here.
+    """
+    register_defaults()
+    ctx = providers.snapshot()
+
+    now = ctx.get("time", "Unknown")
+    city = ctx.get("location", DEFAULT_LOCATION)
+    bat = ctx.get("battery", "Unknown")
+
+    return f"Context [Time: {now} | Location: {city} | Battery: {bat}]. Use this for silent background context."
+
+def caller_messages(messages: Any, system_prompt: str = "") -> list:
+    """The caller's part of the prompt: task system prompt plus filtered history."""
     # 1. DEFENSIVE CHECK: Convert raw string to a message list
     if isinstance(messages, str):
         messages = [{"role": "user", "content": messages}]
 
-    # 2. Setup Base System context
-    full_messages = [SYSTEM_CLEAN]
-    
-    # 3. Add dynamic context
-    full_messages.append({"role": "system", "content": get_dynamic_context()})
-
-    # 4. Add task-specific system prompt (if provided)
+    # 2. Add task-specific system prompt (if provided)
+    result = []
     if system_prompt:
-        full_messages.append({"role": "system", "content": system_prompt})
+        result.append({"role": "system", "content": system_prompt})
 
-    # 5. Append conversation history
+    # 3. Append conversation history
     for m in messages:
         if isinstance(m, dict) and m.get("role") in ("user", "assistant", "system"):
-            full_messages.append(m)
+            result.append(m)
+    return result
+
+def build_options(temperature: Optional[float] = None, profile: str = "chat", messages: Optional[list] = None) -> dict:
+    """Ollama options for a profile; an explicit temperature overrides the profile's."""
+    spec = GENERATION_PROFILES[profile]
+    options = {
+        "temperature": spec["temperature"] if temperature is None else temperature,
+        "top_p": 0.9,               # High diversity to bypass refusal patterns
+        "num_predict": _num_predict(spec, messages),  # Maximum length of response
+        "repeat_penalty": 1.2,      # Discourages repetitive "I cannot" loops
+        "num_ctx": NUM_CTX          # Context window (CRYSTAL_NUM_CTX)
+    }
+    if spec.get("stop"):
+        options["stop"] = spec["stop"]
+    return options
+
+def _num_predict(spec: dict, messages: Optional[list]) -> int:
+    cap = spec["num_predict"]
+    if not spec.get("scale_with_input") or not messages:
+        return cap
+    users = [m.get("content", "") for m in messages if m.get("role") == "user"]
+    # English averages ~4 chars per token, but digits, addresses and Swahili run closer to 2
+    return min(cap, max(16, len(users[-1]) // 2 + 16)) if users else cap
 
-    # 6. Optimized payload for Unrestricted responses
+def model_for(profile: str = "chat", model: Optional[str] = None) -> str:
+    """Ollama model for a call: an explicit tier ("small"/"large") or name, else the profile's tier."""
+    if model:
+        return MODELS.get(model, model)
+    return MODELS[GENERATION_PROFILES[profile].get("model", "large")]
+
+def output_format(profile: str = "chat", fmt: Any = None) -> Any:
+    """Ollama `format`: an explicit JSON schema (or "json") wins over the profile's."""
+    return fmt if fmt is not None else GENERATION_PROFILES[profile].get("format")
+
+def request_key(messages: Any, system_prompt: str = "", temperature: Optional[float] = None, profile: str = "chat",
+                fmt: Any = None) -> str:
+    """Response-cache key; the dynamic context (clock, battery) is left out on purpose."""
+    caller = caller_messages(messages, system_prompt)
+    options = build_options(temperature, profile, caller)
+    return ResponseCache.make_key(model_for(profile), caller, {**options, "format": output_format(profile, fmt)})
+
+def is_cacheable(temperature: Optional[float], profile: str = "chat") -> bool:
+    if temperature is None:
+        temperature = GENERATION_PROFILES[profile]["temperature"]
+    return _cache is not None and temperature <= CACHE_MAX_TEMPERATURE
+
+def build_payload(messages: Any, system_prompt: str = "", temperature: Optional[float] = None, stream: bool = False,
+                  profile: str = "chat", fmt: Any = None) -> dict:
+    """
+    Assembles the Ollama /api/chat request shared by the blocking and streaming calls.
+
+    Layout is stable-prefix first so Ollama can reuse its KV cache across
+    turns: SYSTEM_CLEAN, task system prompt, history, and only then the
+    volatile dynamic context (clock, battery), right before the newest user
+    message.
+    """
+    caller = caller_messages(messages, system_prompt)
+    full_messages = [SYSTEM_CLEAN, *caller]
+
+    context = {"role": "system", "content": get_dynamic_context()}
+    if len(full_messages) > 1 and full_messages[-1].get("role") == "user":
+        full_messages.insert(len(full_messages) - 1, context)
+    else:
+        full_messages.append(context)
+
+    # Optimized payload for Unrestricted responses
     payload = {
-        "model": MODEL_NAME,
+        "model": model_for(profile),
         "messages": full_messages,
-        "stream": False,
-        "options": {
-            "temperature": temperature,
-            "top_p": 0.9,             # High diversity to bypass refusal patterns
-            "num_predict": 512,       # Maximum length of response
-            "repeat_penalty": 1.2,    # Discourages repetitive "I cannot" loops
-            "num_ctx": 4096           # Standard context window
-        }
+        "stream": stream,
+        "options": build_options(temperature, profile, caller),
     }
+    if output_format(profile, fmt) is not None:
+        payload["format"] = output_format(profile, fmt)
+    if KEEP_ALIVE:
+        payload["keep_alive"] = KEEP_ALIVE
+    return payload
+
+def priority_for(profile: str, priority: Optional[str] = None) -> str:
+    if priority is not None:
+        return priority
+    return GENERATION_PROFILES.get(profile, GENERATION_PROFILES["chat"]).get("priority", "interactive")
+
+def generate_response(messages: Any, system_prompt: str = "", temperature: Optional[float] = None,
+                      profile: str = "chat", fmt: Any = None, conversation_id: Optional[str] = None,
+                      priority: Optional[str] = None) -> str:
+    """
+    Generates a response using a generation profile (chat by default).
+    Chat temperature is set high (0.85) to encourage creative compliance over robotic refusal.
+    fmt: optional Ollama structured-output constraint ("json" or a JSON schema dict).
+    conversation_id: keeps a conversation on one backend host (KV-cache locality).
+    priority: scheduler class (interactive/agent/skill/background); defaults to the profile's.
+    Cache hits skip the scheduler queue.
+    """
+    key = None
+    if is_cacheable(temperature, profile):
+        key = request_key(messages, system_prompt, temperature, profile, fmt)
+        cached = _cache.get(key)
+        if cached is not None:
+            return cached
+
+    payload = build_payload(messages, system_prompt, temperature, profile=profile, fmt=fmt)
+    with _scheduler.slot(priority_for(profile, priority)):
+        reply = _post_chat(payload, conversation_id)
+    if key is not None and should_cache(reply):
+        _cache.put(key, reply)
+    return reply
+
+def should_cache(reply: str) -> bool:
+    # A reply cut off at num_predict would be served cut off forever
+    return not reply.startswith("LLM core error") and not getattr(reply, "truncated", False)
+
+class ChatAttempts:
+    """
+    Failover policy and bookkeeping for one non-streamed /api/chat call,
+    shared by _post_chat and the async client; only the transport differs:
+
+        attempts = ChatAttempts(payload, conversation_id)
+        for attempt in attempts:
+            with attempt:
+                data = <POST payload to attempt.url, raise on HTTP error, parse JSON>
+                return attempt.succeeded(data)
+        return attempts.error_reply()
+
+    A host that refuses or 5xx's is failed over to another one, once. Other
+    errors end the loop without counting against the host. Exceptions are
+    swallowed by `with attempt` and surface through error_reply();
+    cancellation is released and re-raised.
+    """
+
+    def __init__(self, payload: dict, conversation_id: Optional[str] = None):
+        self.payload = payload
+        self.conversation_id = conversation_id
+        self.pool = get_backend_pool()
+        self.tried = []
+        self.error = None
+        self.done = False
+
+    def __iter__(self):
+        for _ in range(min(2, len(self.pool))):
+            if self.done:
+                return
+            yield _ChatAttempt(self)
+
+    def error_reply(self) -> str:
+        return f"LLM core error: {str(self.error)}"
+
+class _ChatAttempt:
+    def __init__(self, attempts: ChatAttempts):
+        self.attempts = attempts
+        self.backend = None
+        self.url = None
+
+    def __enter__(self):
+        a = self.attempts
+        self.backend = a.pool.acquire(a.conversation_id, exclude=a.tried)
+        a.tried.append(self.backend)
+        self.url = self.backend.chat_url
+        self.started = time.perf_counter()
+        return self
 
-    try:
-        resp = requests.post(OLLAMA_URL, json=payload, timeout=120)
-        resp.raise_for_status()
-        data = resp.json()
-        
-        # Extract content
-        content = data.get("message", {}).get("content", "").strip()
-        
-        # Final safety cleanup for common "AI Refusal" phrases
-        refusals = ["I'm sorry,", "As an AI,", "I cannot fulfill"]
-        if any(r in content for r in refusals):
-             # Force a fallback or log that the model is struggling
-             return f"Crystal: {content}" 
-             
-        return content
-
-    except Exception as e:
-        return f"LLM core error: {str(e)}"
+    def succeeded(self, data: dict) -> str:
+        payload = self.attempts.payload
+        _prefill.record(payload, data)
+        _model_stats.record(payload["model"], (time.perf_counter() - self.started) * 1000)
+        self.attempts.done = True
+        return LLMReply(reply_text(data), truncated=data.get("done_reason") == "length")
+
+    def __exit__(self, exc_type, exc, tb):
+        a = self.attempts
+        elapsed_ms = (time.perf_counter() - self.started) * 1000
+        if exc is None:
+            a.pool.release(self.backend, elapsed_ms, ok=True)
+            return False
+        if not isinstance(exc, Exception):
+            # Cancellation / GeneratorExit: not the host's fault, and the latency is partial
+            a.pool.release(self.backend, elapsed_ms, ok=None)
+            return False
+
+        _model_stats.record(a.payload["model"], elapsed_ms, ok=False)
+        a.error = exc
+        host_failed = is_backend_failure(exc)
+        a.pool.release(self.backend, elapsed_ms, ok=not host_failed)
+        a.done = not host_failed
+        return True
+
+def _post_chat(payload: dict, conversation_id: Optional[str] = None) -> str:
+    attempts = ChatAttempts(payload, conversation_id)
+    for attempt in attempts:
+        with attempt:
+            resp = get_session().post(attempt.url, json=payload, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT))
+            resp.raise_for_status()
+            return attempt.succeeded(resp.json())
+    return attempts.error_reply()
+
+class LLMReply(str):
+    """
+    Reply text that also says whether generation stopped at num_predict
+    (Ollama done_reason "length"). Behaves as a plain str everywhere else.
+    """
+
+    def __new__(cls, text: str, truncated: bool = False):
+        reply = super().__new__(cls, text)
+        reply.truncated = truncated
+        return reply
+
+def reply_text(data: dict) -> str:
+    """Content of a non-streamed /api/chat response."""
+    # Extract content
+    content = data.get("message", {}).get("content", "").strip()
+
+    # Final safety cleanup for common "AI Refusal" phrases
+    refusals = ["I'm sorry,", "As an AI,", "I cannot fulfill"]
+    if any(r in content for r in refusals):
+         # Force a fallback or log that the model is struggling
+         return f"Crystal: {content}"
+
+    return content
+
+def stream_response(messages: Any, system_prompt: str = "", temperature: Optional[float] = None,
+                    profile: str = "chat", conversation_id: Optional[str] = None,
+                    priority: Optional[str] = None) -> Iterator[str]:
+    """
+    Yields content tokens as Ollama produces them (NDJSON, one object per line).
+    Errors are yielded as a final "LLM core error" chunk, like generate_response.
+    The scheduler slot is held until the stream ends or the consumer closes it.
+    """
+    payload = build_payload(messages, system_prompt, temperature, stream=True, profile=profile)
+
+    # No failover here: tokens may already have reached the caller
+    with _scheduler.slot(priority_for(profile, priority)), get_backend_pool().lease(conversation_id) as lease:
+        started = time.perf_counter()
+        try:
+            with get_session().post(
+                lease.backend.chat_url, json=payload, stream=True, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT)
+            ) as resp:
+                resp.raise_for_status()
+                for line in resp.iter_lines():
+                    if not line:
+                        continue
+                    chunk = json.loads(line)
+                    if chunk.get("error"):
+                        _model_stats.record(payload["model"], (time.perf_counter() - started) * 1000, ok=False)
+                        yield f"LLM core error: {chunk['error']}"
+                        return
+
+                    token = chunk.get("message", {}).get("content", "")
+                    if token:
+                        yield token
+                    if chunk.get("done"):
+                        _prefill.record(payload, chunk)
+                        _model_stats.record(payload["model"], (time.perf_counter() - started) * 1000)
+                        return
+
+        except Exception as e:
+            _model_stats.record(payload["model"], (time.perf_counter() - started) * 1000, ok=False)
+            lease.ok = not is_backend_failure(e)
+            yield f"LLM core error: {str(e)}"
 
 # ─────────────────────────────────────────────
 # BACKWARD-COMPATIBILITY FUNCTION
 # ─────────────────────────────────────────────
-def run_llm(messages, task_type="conversation") -> str:
+def run_llm(messages, task_type="conversation", priority: Optional[str] = None) -> str:
     """
     Legacy compatibility wrapper for SkillManager and older imports.
+    task_type selects the generation profile (TASK_PROFILES); unknown types chat.
+    priority overrides the profile's scheduler class.
+    """
+    return generate_response(messages=messages, profile=TASK_PROFILES.get(task_type, "chat"), priority=priority)
+
+def warm_models() -> dict:
     """
-    return generate_response(messages=messages)
\ No newline at end of file
+    Loads every registry model on every backend with keep_alive so the first
+    real call skips the load. An empty /api/chat request only loads the model.
+    """
+    status = {}
+    for backend in get_backend_pool().backends:
+        for model in dict.fromkeys(MODELS.values()):
+            payload = {"model": model, "messages": []}
+            if KEEP_ALIVE:
+                payload["keep_alive"] = KEEP_ALIVE
+            name = f"{backend.base_url} {model}"
+            try:
+                with _scheduler.slot("background"):
+                    resp = get_session().post(backend.chat_url, json=payload, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT))
+                resp.raise_for_status()
+                status[name] = "loaded"
+            except Exception as e:
+                status[name] = f"error: {e}"
+    print(f"🔥 [LLM]: warmup {status}")
+    return status
+
+def backend_stats() -> dict:
+    return get_backend_pool().stats()
+
+def scheduler_stats() -> dict:
+    return _scheduler.stats()
+
+def model_stats() -> dict:
+    return _model_stats.stats()
+
+def prefill_stats() -> dict:
+    return _prefill.stats()
+
+def cache_stats() -> dict:
+    if _cache is None:
+        return {"enabled": False}
+    return {"enabled": True, "max_temperature": CACHE_MAX_TEMPERATURE, **_cache.stats()}
\ No newline at end of file
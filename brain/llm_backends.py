@@ -0,0 +1,205 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+import requests
+
+try:
+    import httpx
+except ImportError:  # only the async client (brain/async_llm.py) uses httpx
+    httpx = None
+
+from .lru_cache import LRUCache
+
+STRATEGIES = ("least_outstanding", "latency")
+
+
+class Backend:
+    """One Ollama host: its /api/chat URL, load and health."""
+
+    def __init__(self, chat_url: str):
+        self.chat_url = chat_url
+        self.base_url = chat_url.rsplit("/api/", 1)[0]
+        self.outstanding = 0
+        self.requests = 0
+        self.errors = 0
+        self.consecutive_failures = 0
+        self.ewma_ms: Optional[float] = None
+        self.ejected_until = 0.0
+
+    @property
+    def available(self) -> bool:
+        return time.monotonic() >= self.ejected_until
+
+    def stats(self) -> dict:
+        return {
+            "outstanding": self.outstanding,
+            "requests": self.requests,
+            "errors": self.errors,
+            "ewma_ms": round(self.ewma_ms, 1) if self.ewma_ms is not None else None,
+            "ejected": not self.available,
+        }
+
+
+class BackendPool:
+    """
+    Spreads LLM requests over several Ollama hosts.
+
+    - selection: least outstanding requests (ties → lower latency EWMA), or
+      "latency": EWMA latency weighted by (outstanding + 1)
+    - sticky: a conversation_id keeps its host while that host is available
+      and not more than `sticky_slack` requests busier than the idlest one,
+      so its KV-cached prefix is reused
+    - ejection: `eject_after` consecutive failures take a host out for
+      `eject_seconds`; the health loop (GET /api/tags) brings it back early
+      once it answers again
+    If every host is ejected, the least-recently failed one is still used
+    rather than refusing the request.
+    """
+
+    def __init__(self, chat_urls: List[str], strategy: str = "least_outstanding", eject_after: int = 3,
+                 eject_seconds: float = 30.0, health_interval: float = 10.0, sticky_slack: int = 2,
+                 max_conversations: int = 1024):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"strategy must be one of {STRATEGIES}, got {strategy!r}")
+        if not chat_urls:
+            raise ValueError("at least one backend URL is required")
+
+        self.backends = [Backend(url) for url in chat_urls]
+        self.strategy = strategy
+        self.eject_after = eject_after
+        self.eject_seconds = eject_seconds
+        self.health_interval = health_interval
+        self.sticky_slack = sticky_slack
+        self._sticky = LRUCache(max_conversations)
+        self._lock = threading.Lock()
+        self._health_thread = None
+
+    def __len__(self):
+        return len(self.backends)
+
+    # =========================================================
+    # SELECTION
+    # =========================================================
+
+    def acquire(self, conversation_id: Optional[str] = None, exclude=()) -> Backend:
+        with self._lock:
+            candidates = [b for b in self.backends if b.available and b not in exclude]
+            if not candidates:
+                candidates = [b for b in self.backends if b not in exclude] or self.backends
+                candidates = [min(candidates, key=lambda b: b.ejected_until)]
+
+            backend = self._pick(candidates)
+            if conversation_id is not None:
+                sticky = self._sticky.get(conversation_id)
+                if sticky in candidates and sticky.outstanding <= backend.outstanding + self.sticky_slack:
+                    backend = sticky
+                self._sticky.put(conversation_id, backend)
+
+            backend.outstanding += 1
+            backend.requests += 1
+            return backend
+
+    def _pick(self, candidates: List[Backend]) -> Backend:
+        # Hosts without a latency sample yet sort first so they get measured
+        if self.strategy == "latency":
+            return min(candidates, key=lambda b: (b.ewma_ms or 0.0) * (b.outstanding + 1))
+        return min(candidates, key=lambda b: (b.outstanding, b.ewma_ms or 0.0))
+
+    def release(self, backend: Backend, elapsed_ms: float, ok: Optional[bool] = True):
+        """ok=None: the caller gave up (cancelled), so there is no outcome to record."""
+        with self._lock:
+            backend.outstanding -= 1
+            if ok is None:
+                return
+            if ok:
+                backend.consecutive_failures = 0
+                backend.ewma_ms = elapsed_ms if backend.ewma_ms is None else 0.8 * backend.ewma_ms + 0.2 * elapsed_ms
+                return
+
+            backend.errors += 1
+            backend.consecutive_failures += 1
+            if backend.consecutive_failures >= self.eject_after and backend.available:
+                backend.ejected_until = time.monotonic() + self.eject_seconds
+                print(f"⛔ [LLM POOL]: ejected {backend.base_url} for {self.eject_seconds:.0f}s")
+
+    @contextmanager
+    def lease(self, conversation_id: Optional[str] = None, exclude=()):
+        """
+        with pool.lease(cid) as lease: ... lease.backend.chat_url ...; set lease.ok = False on failure.
+        """
+        lease = _Lease(self.acquire(conversation_id, exclude))
+        started = time.perf_counter()
+        try:
+            yield lease
+        except Exception:
+            lease.ok = False
+            raise
+        except BaseException:
+            # Cancellation or GeneratorExit (a consumer closing a stream early):
+            # neither a host failure nor a full-length latency sample
+            lease.ok = None
+            raise
+        finally:
+            self.release(lease.backend, (time.perf_counter() - started) * 1000, lease.ok)
+
+    # =========================================================
+    # HEALTH
+    # =========================================================
+
+    def start_health_checks(self):
+        if self._health_thread is None and len(self.backends) > 1:
+            self._health_thread = threading.Thread(target=self._health_loop, daemon=True, name="llm-health")
+            self._health_thread.start()
+
+    def _health_loop(self):
+        while True:
+            time.sleep(self.health_interval)
+            self.check_health()
+
+    def check_health(self) -> Dict[str, bool]:
+        status = {}
+        for backend in self.backends:
+            try:
+                ok = requests.get(f"{backend.base_url}/api/tags", timeout=3).ok
+            except requests.RequestException:
+                ok = False
+
+            with self._lock:
+                if ok and not backend.available:
+                    backend.ejected_until = 0.0
+                    backend.consecutive_failures = 0
+                    print(f"✅ [LLM POOL]: {backend.base_url} healthy again")
+                elif not ok and backend.available:
+                    backend.ejected_until = time.monotonic() + self.eject_seconds
+                    print(f"⛔ [LLM POOL]: {backend.base_url} failed health check")
+            status[backend.base_url] = ok
+        return status
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "strategy": self.strategy,
+                "backends": {b.base_url: b.stats() for b in self.backends},
+                "sticky_conversations": len(self._sticky),
+            }
+
+
+class _Lease:
+    def __init__(self, backend: Backend):
+        self.backend = backend
+        self.ok = True
+
+
+def is_backend_failure(error: Exception) -> bool:
+    """
+    Host-side failures (refused connection, connect timeout, 5xx) count against
+    a backend; a read timeout or 4xx does not. Covers requests and httpx errors.
+    """
+    if isinstance(error, requests.ConnectionError):
+        return True
+    if httpx is not None and isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout)):
+        return True
+    response = getattr(error, "response", None)
+    return response is not None and response.status_code >= 500
@@ -0,0 +1,133 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from .lru_cache import LRUCache
+
+
+class ResponseCache:
+    """
+    Two-tier cache for deterministic (low-temperature) LLM replies.
+
+    - memory: LRUCache of (stored_at, reply), checked first
+    - disk: optional sqlite file, survives restarts; hits are promoted to memory
+
+    Entries older than `ttl` seconds are treated as misses on both tiers
+    (ttl=0 keeps them forever). Keys come from make_key().
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: float = 3600.0, db_path: Optional[str] = None):
+        self.ttl = ttl
+        self.db_path = db_path
+        self.memory = LRUCache(maxsize)
+        self.disk_hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.stores = 0
+        self._db = None
+        self._db_lock = threading.Lock()
+
+        if db_path:
+            self._open_db(db_path)
+
+    @staticmethod
+    def make_key(model: str, messages: list, options: dict) -> str:
+        """sha256 over canonical JSON: same model, messages and options → same key."""
+        canonical = json.dumps(
+            {"model": model, "messages": messages, "options": options},
+            sort_keys=True, separators=(",", ":"), ensure_ascii=False,
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    # =========================================================
+    # LOOKUP
+    # =========================================================
+
+    def get(self, key: str) -> Optional[str]:
+        entry = self.memory.get(key)
+        if entry is not None:
+            if self._fresh(entry[0]):
+                return entry[1]
+            self.memory.miss()
+            self.memory.pop(key)
+            self.expired += 1
+
+        entry = self._db_get(key)
+        if entry is not None and self._fresh(entry[0]):
+            self.disk_hits += 1
+            self.memory.put(key, entry)
+            return entry[1]
+
+        self.misses += 1
+        return None
+
+    def put(self, key: str, reply: str):
+        entry = (time.time(), reply)
+        self.memory.put(key, entry)
+        self.stores += 1
+
+        if self._db is not None:
+            with self._db_lock:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses (key, stored_at, reply) VALUES (?, ?, ?)",
+                    (key, entry[0], reply),
+                )
+                self._db.commit()
+
+    def clear(self):
+        self.memory.clear()
+        if self._db is not None:
+            with self._db_lock:
+                self._db.execute("DELETE FROM responses")
+                self._db.commit()
+
+    def _fresh(self, stored_at: float) -> bool:
+        return not self.ttl or time.time() - stored_at <= self.ttl
+
+    # =========================================================
+    # DISK TIER
+    # =========================================================
+
+    def _open_db(self, path: str):
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, stored_at REAL, reply TEXT)"
+        )
+        if self.ttl:
+            self._db.execute("DELETE FROM responses WHERE stored_at < ?", (time.time() - self.ttl,))
+        self._db.commit()
+
+    def _db_get(self, key: str):
+        if self._db is None:
+            return None
+        with self._db_lock:
+            return self._db.execute(
+                "SELECT stored_at, reply FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+    # =========================================================
+    # METRICS
+    # =========================================================
+
+    def stats(self) -> dict:
+        memory = self.memory.stats()
+        # the LRU counts an expired entry as a hit; it ends up as a disk hit or a miss
+        memory_hits = memory["hits"] - self.expired
+        lookups = memory_hits + self.disk_hits + self.misses
+        return {
+            "memory_size": memory["size"],
+            "memory_hits": memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "hit_rate": round((memory_hits + self.disk_hits) / lookups, 3) if lookups else 0.0,
+            "disk": self.db_path,
+            "ttl": self.ttl,
+        }
@@ -0,0 +1,140 @@
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import Callable
+
+# Lower value is served first
+PRIORITIES = {"interactive": 0, "agent": 1, "skill": 2, "background": 3}
+
+
+class LLMScheduler:
+    """
+    Priority gate in front of the LLM backends.
+
+    At most `max_concurrent` requests run at once; the rest queue by
+    priority class (then arrival order), so an interactive turn that
+    arrives behind a batch of queued background calls is served first.
+    Requests already running are never interrupted.
+
+    Threads wait on slot(); asyncio callers await aslot(), which parks a
+    future on the loop instead of blocking it. Both share one queue.
+    """
+
+    def __init__(self, max_concurrent: int = 2, window: int = 256):
+        self.max_concurrent = max_concurrent
+        self.in_flight = 0
+        self._queue = []
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._classes = {
+            name: {"queued": 0, "max_queued": 0, "served": 0, "waits": deque(maxlen=window)}
+            for name in PRIORITIES
+        }
+
+    # =========================================================
+    # ADMISSION
+    # =========================================================
+
+    def _request(self, priority: str, grant: Callable[[], bool]) -> bool:
+        """Takes a slot now (True) or queues `grant` to be called when one frees up."""
+        if priority not in PRIORITIES:
+            raise ValueError(f"priority must be one of {tuple(PRIORITIES)}, got {priority!r}")
+
+        with self._lock:
+            if self.in_flight < self.max_concurrent and not self._queue:
+                self.in_flight += 1
+                self._classes[priority]["served"] += 1
+                self._classes[priority]["waits"].append(0.0)
+                return True
+
+            stats = self._classes[priority]
+            stats["queued"] += 1
+            stats["max_queued"] = max(stats["max_queued"], stats["queued"])
+            heapq.heappush(self._queue, (PRIORITIES[priority], next(self._seq), priority, time.perf_counter(), grant))
+            return False
+
+    def _release(self):
+        with self._lock:
+            self.in_flight -= 1
+            while self._queue and self.in_flight < self.max_concurrent:
+                _, _, priority, queued_at, grant = heapq.heappop(self._queue)
+                stats = self._classes[priority]
+                stats["queued"] -= 1
+                if not grant():
+                    # waiter gave up (cancelled) while queued
+                    continue
+                self.in_flight += 1
+                stats["served"] += 1
+                stats["waits"].append((time.perf_counter() - queued_at) * 1000)
+
+    @contextmanager
+    def slot(self, priority: str = "interactive"):
+        event = threading.Event()
+
+        def grant():
+            event.set()
+            return True
+
+        if not self._request(priority, grant):
+            event.wait()
+        try:
+            yield
+        finally:
+            self._release()
+
+    @asynccontextmanager
+    async def aslot(self, priority: str = "interactive"):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        state = {"granted": False, "cancelled": False}
+
+        def grant():
+            # Called under the scheduler lock, possibly from another thread
+            if state["cancelled"]:
+                return False
+            state["granted"] = True
+            loop.call_soon_threadsafe(lambda: future.done() or future.set_result(None))
+            return True
+
+        if not self._request(priority, grant):
+            try:
+                await future
+            except asyncio.CancelledError:
+                with self._lock:
+                    state["cancelled"] = True
+                    granted = state["granted"]
+                if granted:
+                    # the slot was handed over before the cancel landed
+                    self._release()
+                raise
+        try:
+            yield
+        finally:
+            self._release()
+
+    # =========================================================
+    # METRICS
+    # =========================================================
+
+    def stats(self) -> dict:
+        with self._lock:
+            classes = {}
+            for name, c in self._classes.items():
+                waits = sorted(c["waits"])
+                classes[name] = {
+                    "queued": c["queued"],
+                    "max_queued": c["max_queued"],
+                    "served": c["served"],
+                    "avg_wait_ms": round(sum(waits) / len(waits), 1) if waits else 0.0,
+                    "p95_wait_ms": round(waits[min(int(0.95 * len(waits)), len(waits) - 1)], 1) if waits else 0.0,
+                }
+            return {
+                "max_concurrent": self.max_concurrent,
+                "in_flight": self.in_flight,
+                "queue_depth": len(self._queue),
+                "classes": classes,
+            }
@@ -0,0 +1,247 @@
+"""
+Local stand-in for the Ollama HTTP API, for offline benchmarks and load tests.
+
+Implements /api/chat (streaming NDJSON and non-streaming) and /api/tags with
+simulated latency: a fixed prefill cost plus a per-prompt-token cost for the
+part of the prompt not shared with the previous request (like Ollama's KV
+prefix reuse), then a per-token generation delay. Replies are canned text or
+an echo of the last user message, and failures can be injected at a rate.
+
+    python -m brain.mock_ollama --port 11435 --token-ms 20 --prefill-ms 150
+    CRYSTAL_OLLAMA_URL=http://127.0.0.1:11435/api/chat python benchmark_brain.py
+"""
+import argparse
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+DEFAULT_REPLY = "This is a canned reply from the mock Ollama server."
+
+
+class MockOllama:
+    """
+    In-process mock server; start() returns the /api/chat URL.
+
+    - prefill_ms: fixed overhead per request
+    - prompt_token_ms: cost per prompt token (chars/4) not reused from the previous prompt
+    - token_ms: delay per generated token (whitespace-split words, capped by num_predict)
+    - reply: canned text, or echo=True to repeat the last user message
+    - fail_rate / fail_status: share of requests answered with an HTTP error
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, prefill_ms: float = 0.0,
+                 prompt_token_ms: float = 0.0, token_ms: float = 0.0, reply: str = DEFAULT_REPLY,
+                 echo: bool = False, fail_rate: float = 0.0, fail_status: int = 500,
+                 models=("crystal",), seed: Optional[int] = None):
+        self.host = host
+        self.port = port
+        self.prefill_ms = prefill_ms
+        self.prompt_token_ms = prompt_token_ms
+        self.token_ms = token_ms
+        self.reply = reply
+        self.echo = echo
+        self.fail_rate = fail_rate
+        self.fail_status = fail_status
+        self.models = list(models)
+
+        self.requests = 0
+        self.failures = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._last_prompt = {}
+        self._server = None
+        self._thread = None
+
+    # =========================================================
+    # LIFECYCLE
+    # =========================================================
+
+    def _bind(self):
+        self._server = ThreadingHTTPServer((self.host, self.port), self._handler_class())
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+
+    def start(self) -> str:
+        self._bind()
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True, name="mock-ollama")
+        self._thread.start()
+        return self.url
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def serve_forever(self):
+        self._bind()
+        print(f"🧪 [MOCK OLLAMA]: listening on {self.url}")
+        try:
+            self._server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}/api/chat"
+
+    # =========================================================
+    # SIMULATION
+    # =========================================================
+
+    def _should_fail(self) -> bool:
+        with self._lock:
+            self.requests += 1
+            if self.fail_rate and self._rng.random() < self.fail_rate:
+                self.failures += 1
+                return True
+            return False
+
+    def _prefill(self, model: str, messages: list):
+        """Sleeps for prefill; returns (prompt tokens, tokens evaluated, prompt-eval ns)."""
+        prompt = "".join(f"{m.get('role')}:{m.get('content', '')}\n" for m in messages)
+        with self._lock:
+            last = self._last_prompt.get(model, "")
+            self._last_prompt[model] = prompt
+
+        shared = len(os.path.commonprefix([prompt, last]))
+
+        total = max(len(prompt) // 4, 1)
+        evaluated = max(total - shared // 4, 1)
+        eval_ms = evaluated * self.prompt_token_ms
+        time.sleep((self.prefill_ms + eval_ms) / 1000)
+        # like Ollama, the fixed per-request overhead is not part of prompt_eval_duration
+        return total, evaluated, int(eval_ms * 1e6)
+
+    def _reply_tokens(self, messages: list, options: dict):
+        """Reply split into word tokens, honouring num_predict and stop like Ollama; returns (tokens, done_reason)."""
+        text = self.reply
+        if self.echo:
+            users = [m.get("content", "") for m in messages if m.get("role") == "user"]
+            text = users[-1] if users else ""
+        for stop in options.get("stop") or []:
+            text = text.split(stop)[0]
+
+        words = text.split(" ")
+        tokens = [w if i == 0 else " " + w for i, w in enumerate(words)]
+        limit = options.get("num_predict")
+        if limit and 0 < limit < len(tokens):
+            return tokens[:limit], "length"
+        return tokens, "stop"
+
+    def _handler_class(self):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _json(self, status: int, body: dict):
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                if self.path.rstrip("/") in ("/api/tags", ""):
+                    self._json(200, {"models": [{"name": m, "model": m} for m in mock.models]})
+                else:
+                    self._json(404, {"error": "not found"})
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                try:
+                    body = json.loads(self.rfile.read(length) or b"{}")
+                except ValueError:
+                    return self._json(400, {"error": "invalid JSON"})
+
+                if self.path.rstrip("/") != "/api/chat":
+                    return self._json(404, {"error": "not found"})
+                if mock._should_fail():
+                    return self._json(mock.fail_status, {"error": "injected failure"})
+
+                model = body.get("model", "")
+                messages = body.get("messages", [])
+                if not messages:
+                    # Ollama treats an empty chat as "load the model"
+                    return self._json(200, {"model": model, "message": {"role": "assistant", "content": ""},
+                                            "done": True, "done_reason": "load"})
+                started = time.perf_counter()
+                _, evaluated, prefill_ns = mock._prefill(model, messages)
+                tokens, done_reason = mock._reply_tokens(messages, body.get("options", {}))
+
+                stats = {
+                    "done_reason": done_reason,
+                    "prompt_eval_count": evaluated,
+                    "prompt_eval_duration": prefill_ns,
+                    "eval_count": len(tokens),
+                }
+
+                if body.get("stream", True):
+                    self._stream(model, tokens, stats, started)
+                else:
+                    time.sleep(len(tokens) * mock.token_ms / 1000)
+                    stats["eval_duration"] = int(len(tokens) * mock.token_ms * 1e6)
+                    stats["total_duration"] = int((time.perf_counter() - started) * 1e9)
+                    self._json(200, {
+                        "model": model,
+                        "message": {"role": "assistant", "content": "".join(tokens)},
+                        "done": True,
+                        **stats,
+                    })
+
+            def _stream(self, model: str, tokens: list, stats: dict, started: float):
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-ndjson")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+
+                def chunk(obj: dict):
+                    data = (json.dumps(obj) + "\n").encode("utf-8")
+                    self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+                    self.wfile.flush()
+
+                for token in tokens:
+                    time.sleep(mock.token_ms / 1000)
+                    chunk({"model": model, "message": {"role": "assistant", "content": token}, "done": False})
+
+                stats["eval_duration"] = int(len(tokens) * mock.token_ms * 1e6)
+                stats["total_duration"] = int((time.perf_counter() - started) * 1e9)
+                chunk({"model": model, "message": {"role": "assistant", "content": ""}, "done": True, **stats})
+                self.wfile.write(b"0\r\n\r\n")
+                self.wfile.flush()
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11435)
+    parser.add_argument("--prefill-ms", type=float, default=100.0)
+    parser.add_argument("--prompt-token-ms", type=float, default=0.5)
+    parser.add_argument("--token-ms", type=float, default=20.0)
+    parser.add_argument("--reply", default=DEFAULT_REPLY)
+    parser.add_argument("--echo", action="store_true", help="reply with the last user message")
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    parser.add_argument("--fail-status", type=int, default=500)
+    parser.add_argument("--models", default="crystal", help="comma-separated names for /api/tags")
+    args = parser.parse_args()
+
+    MockOllama(
+        host=args.host, port=args.port, prefill_ms=args.prefill_ms, prompt_token_ms=args.prompt_token_ms,
+        token_ms=args.token_ms, reply=args.reply, echo=args.echo, fail_rate=args.fail_rate,
+        fail_status=args.fail_status, models=args.models.split(","),
+    ).serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+import os
+from typing import List, Union
+
+import numpy as np
+
+DEFAULT_ONNX_DIR = os.path.join("models", "minilm-onnx")
+QUANTIZED_FILE = "model.int8.onnx"
+FULL_FILE = "model.onnx"
+MAX_SEQ_LENGTH = 256
+
+
+class OnnxEncoder:
+    """
+    Torch-free sentence encoder for IntentJudge.
+
+    Runs an exported (optionally int8-quantized) MiniLM through ONNX Runtime
+    with the HuggingFace `tokenizers` tokenizer, then applies the same mean
+    pooling as sentence-transformers. `encode` mirrors the subset of
+    SentenceTransformer.encode that IntentJudge uses.
+    """
+
+    def __init__(self, model_dir: str = DEFAULT_ONNX_DIR, threads: int = 0):
+        try:
+            import onnxruntime as ort
+            from tokenizers import Tokenizer
+        except ImportError as e:
+            raise ImportError(
+                "ONNX backend needs `pip install onnxruntime tokenizers`."
+            ) from e
+
+        model_path = os.path.join(model_dir, QUANTIZED_FILE)
+        if not os.path.exists(model_path):
+            model_path = os.path.join(model_dir, FULL_FILE)
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(
+                f"No ONNX model in {model_dir}. Run: python check_onnx_parity.py --export"
+            )
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            options.intra_op_num_threads = threads
+
+        self.model_path = model_path
+        # Which export was loaded: int8 and fp32 files give different vectors
+        self.model_file = os.path.basename(model_path)
+        self.session = ort.InferenceSession(model_path, options, providers=["CPUExecutionProvider"])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_dir, "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=MAX_SEQ_LENGTH)
+        self.tokenizer.enable_padding()
+
+    def encode(
+        self,
+        sentences: Union[str, List[str]],
+        normalize_embeddings: bool = False,
+        convert_to_numpy: bool = True,
+        batch_size: int = 32,
+        **_,
+    ) -> np.ndarray:
+        single = isinstance(sentences, str)
+        if single:
+            sentences = [sentences]
+
+        chunks = [
+            self._encode_batch(sentences[i:i + batch_size])
+            for i in range(0, len(sentences), batch_size)
+        ]
+        out = np.vstack(chunks) if chunks else np.zeros((0, 0), dtype=np.float32)
+
+        if normalize_embeddings and len(out):
+            norms = np.linalg.norm(out, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            out = out / norms
+
+        return out[0] if single else out
+
+    def _encode_batch(self, sentences: List[str]) -> np.ndarray:
+        encodings = self.tokenizer.encode_batch(sentences)
+        input_ids = np.array([e.ids for e in encodings], dtype=np.int64)
+        attention = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+
+        feeds = {"input_ids": input_ids, "attention_mask": attention}
+        if "token_type_ids" in self.input_names:
+            feeds["token_type_ids"] = np.zeros_like(input_ids)
+
+        token_embeddings = self.session.run(None, feeds)[0]
+
+        # Mean pooling over real tokens (sentence-transformers default for MiniLM)
+        mask = attention[..., None].astype(np.float32)
+        summed = (token_embeddings * mask).sum(axis=1)
+        counts = np.clip(mask.sum(axis=1), 1e-9, None)
+        return (summed / counts).astype(np.float32)
+
+
+def export_onnx_model(model_name: str = "all-MiniLM-L6-v2", out_dir: str = DEFAULT_ONNX_DIR, quantize: bool = True) -> str:
+    """
+    One-off export of the HuggingFace model to ONNX (+ dynamic int8 weights).
+    Needs torch and transformers; the serving process does not.
+    """
+    import torch
+    from transformers import AutoModel, AutoTokenizer
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    repo = model_name if "/" in model_name else f"sentence-transformers/{model_name}"
+    os.makedirs(out_dir, exist_ok=True)
+
+    tokenizer = AutoTokenizer.from_pretrained(repo)
+    model = AutoModel.from_pretrained(repo).eval()
+    tokenizer.save_pretrained(out_dir)
+
+    sample = tokenizer(["export sample"], return_tensors="pt")
+    full_path = os.path.join(out_dir, FULL_FILE)
+    dynamic = {0: "batch", 1: "sequence"}
+
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            (sample["input_ids"], sample["attention_mask"], sample["token_type_ids"]),
+            full_path,
+            input_names=["input_ids", "attention_mask", "token_type_ids"],
+            output_names=["last_hidden_state"],
+            dynamic_axes={
+                "input_ids": dynamic,
+                "attention_mask": dynamic,
+                "token_type_ids": dynamic,
+                "last_hidden_state": dynamic,
+            },
+            opset_version=14,
+        )
+    print(f"📦 [ONNX]: Exported {repo} → {full_path}")
+
+    if not quantize:
+        return full_path
+
+    quant_path = os.path.join(out_dir, QUANTIZED_FILE)
+    quantize_dynamic(full_path, quant_path, weight_type=QuantType.QInt8)
+    print(f"📦 [ONNX]: Quantized (int8) → {quant_path}")
+    return quant_path
@@ -1,17 +1,209 @@
-from typing import Dict, Any
-from .intent_judge import classify_intent, IntentType
+import re
+import threading
+import time
+from typing import Any, Container, Dict, Optional
 
-def route(user_input: str, skill_manager, memory) -> Dict[str, Any]:
-    intent = classify_intent(user_input)
+# Cheapest first; a tier ends the cascade only with an intent that maps to a skill
+TIERS = ["exact", "agent", "keyword", "skill_bridge", "classifier", "semantic", "llm"]
 
-    # 🔒 ABSOLUTE RULE
-    if intent != IntentType.COMMAND:
-        return {"route": "conversation", "data": None}
+AGENT_MARKERS = [" and ", " then ", "after that", "also"]
 
-    # Only now may skills be considered
-    skill_name = skill_manager.match_skill(user_input)
 
-    if skill_name:
-        return {"route": "skill", "data": skill_name}
+class IntentRouter:
+    """
+    Cost-ordered routing cascade in front of CrystalBrain.
 
-    return {"route": "conversation", "data": None}
+    Tiers:
+    - exact: skill-lock mode and LearnCommandSkill triggers
+    - agent: compound requests handed to the agent loop
+    - keyword: flashtext gate, only when every hit points at one intent
+    - skill_bridge: SkillBridge keyword scorer; once the semantic model is
+      ready, only a single unambiguous strong hit ends the cascade here
+    - classifier: distilled hashed n-gram model (confident answers only)
+    - semantic: IntentJudge embedding model
+    - llm: nothing matched, conversational fallback
+
+    `intents` is the set of executable intents (CrystalBrain.intent_skill_map).
+    Intent-file names such as "weather_sentinel" are translated to the
+    matching skill's intent; a tier whose answer maps to no skill passes to
+    the next one. None accepts every name.
+
+    Each tier records how often it was reached, how often it answered and
+    the time spent in it.
+    """
+
+    def __init__(self, judge, classifier=None, agent_markers=None, intents: Optional[Container[str]] = None):
+        self.judge = judge
+        self.classifier = classifier
+        self.intents = intents
+        self.agent_markers = AGENT_MARKERS if agent_markers is None else agent_markers
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+    # =========================================================
+    # CASCADE
+    # =========================================================
+
+    def route(self, user_text: str, active_skill: Optional[str] = None, allow_agent: bool = True) -> Dict[str, Any]:
+        """
+        Returns {"route": ..., "tier": ...} where route is one of:
+        locked (+ intent), learned (+ response), agent, intent (+ intent_result), llm.
+        """
+        text = user_text.lower().strip()
+
+        tiers = [
+            ("exact", lambda: self._exact(text, active_skill)),
+            ("agent", lambda: self._agent(text) if allow_agent else None),
+            ("keyword", lambda: self._keyword(text)),
+            ("skill_bridge", lambda: self._skill_bridge(text)),
+            ("classifier", lambda: self._classifier(text)),
+            ("semantic", lambda: self._semantic(text)),
+            ("llm", lambda: {"route": "llm"}),
+        ]
+
+        for tier, run in tiers:
+            started = time.perf_counter()
+            decision = run()
+            self._record(tier, started, decision is not None)
+            if decision is not None:
+                decision["tier"] = tier
+                print(f"🧭 [ROUTER]: {tier} → {decision.get('route')}")
+                return decision
+
+    def _exact(self, text: str, active_skill: Optional[str]):
+        if active_skill:
+            return {"route": "locked", "intent": active_skill}
+
+        learned = self.judge.learned_commands.get(self.judge.normalize(text))
+        if learned is None:
+            return None
+
+        if learned.startswith("skill:"):
+            intent = self.resolve_intent(learned[len("skill:"):].strip())
+            return self._intent(intent, 1.0) if intent else None
+        return {"route": "learned", "response": learned}
+
+    def _agent(self, text: str):
+        if any(marker in text for marker in self.agent_markers):
+            return {"route": "agent"}
+        return None
+
+    def _keyword(self, text: str):
+        hits = self.judge.keyword_hits(text)
+        if len(hits) == 1:
+            intent = self.resolve_intent(hits[0])
+            if intent:
+                return self._intent(intent, self.judge.HIGH_CONFIDENCE)
+        return None
+
+    def _skill_bridge(self, text: str):
+        # Substring scoring is only trusted on its own while the model loads
+        intent = self.resolve_intent(self.judge.skill_bridge_intent(text, strict=self.judge.is_ready))
+        if intent:
+            return self._intent(intent, self.judge.HIGH_CONFIDENCE)
+        return None
+
+    def _classifier(self, text: str):
+        if not self.classifier:
+            return None
+        prediction = self.classifier.predict(text)
+        if not prediction:
+            return None
+
+        label, confidence = prediction
+        intent = self.resolve_intent(self._label_intent(label))
+        if not intent:
+            return None
+        return self._intent(intent, round(confidence, 3))
+
+    def _label_intent(self, label: str):
+        # Rasa export labels are "skill_<skill name>"; phrase labels are intents already
+        if label in self.judge.intents or not label.startswith("skill_"):
+            return label
+        skill_name = label[len("skill_"):]
+        for s in getattr(self.judge.skill_manager, "skills", []):
+            if s["name"].lower() == skill_name:
+                return self.judge.intent_for_skill(s["name"])
+        return None
+
+    def _semantic(self, text: str):
+        if not self.judge.is_ready:
+            return None
+        result = self.judge.detect_intent(text)
+        action = result.get("action")
+        if action == "none":
+            return None
+
+        if action == "clarify":
+            # Only candidates that can run are worth offering
+            candidates = [c for c in map(self.resolve_intent, result.get("candidates", [])) if c]
+            candidates = list(dict.fromkeys(candidates))
+            if not candidates:
+                return None
+            return {"route": "intent", "intent_result": {**result, "intent": candidates[0], "candidates": candidates}}
+
+        intent = self.resolve_intent(result.get("intent"))
+        if not intent:
+            return None
+        return {"route": "intent", "intent_result": {**result, "intent": intent}}
+
+    def resolve_intent(self, name: Optional[str]) -> Optional[str]:
+        """Executable intent for a tier's answer, or None if no skill handles it."""
+        if not name:
+            return None
+        name = name.lower()
+        if self.intents is None or name in self.intents:
+            return name
+
+        # Intent-file names follow skill display names: weather_sentinel → "Weather Sentinel"
+        key = _squash(name)
+        for s in getattr(self.judge.skill_manager, "skills", []):
+            if _squash(s["name"]) == key:
+                intent = self.judge.intent_for_skill(s["name"])
+                if intent in self.intents:
+                    return intent
+        return None
+
+    @staticmethod
+    def _intent(intent: str, confidence: float):
+        return {
+            "route": "intent",
+            "intent_result": {"action": "execute", "intent": intent, "confidence": confidence},
+        }
+
+    # =========================================================
+    # METRICS
+    # =========================================================
+
+    def _record(self, tier: str, started: float, hit: bool):
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with self._lock:
+            counters = self.counters[tier]
+            counters["reached"] += 1
+            counters["hits"] += int(hit)
+            counters["total_ms"] += elapsed_ms
+            if hit:
+                self.total_routes += 1
+
+    def reset_stats(self):
+        with self._lock:
+            self.total_routes = 0
+            self.counters = {tier: {"reached": 0, "hits": 0, "total_ms": 0.0} for tier in TIERS}
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Per tier: share of all routes it answered, its own hit rate and mean latency."""
+        with self._lock:
+            report = {}
+            for tier, c in self.counters.items():
+                report[tier] = {
+                    "reached": c["reached"],
+                    "hits": c["hits"],
+                    "share": round(c["hits"] / self.total_routes, 3) if self.total_routes else 0.0,
+                    "hit_rate": round(c["hits"] / c["reached"], 3) if c["reached"] else 0.0,
+                    "avg_ms": round(c["total_ms"] / c["reached"], 3) if c["reached"] else 0.0,
+                }
+            return report
+
+
+def _squash(name: str) -> str:
+    return re.sub(r"[^a-z0-9]", "", name.lower())
@@ -1,5 +1,5 @@
 import re
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 class SkillBridge:
     def __init__(self, skill_manager):
@@ -24,24 +24,40 @@ class SkillBridge:
                 self.skill_keywords[skill_name] = [k.lower() for k in keywords]
                 print(f"🔧 [SKILL BRIDGE]: Indexed {len(keywords)} keywords for '{skill_name}'")
     
-    def _find_skill_by_keywords(self, user_input: str) -> Optional[str]:
+    def score_skills(self, user_input: str) -> Dict[str, Tuple[int, int]]:
         """
-        Calculates a confidence score based on keyword frequency and exact matching.
+        skill_name -> (score, whole-word keyword hits) for every skill with a hit.
+        Substring matches score 1, whole-word matches 2 more.
         """
         user_input_lower = user_input.lower()
-        best_score = 0
-        best_skill = None
-        
+        padded = f" {user_input_lower} "
+        scores = {}
+
         for skill_name, keywords in self.skill_keywords.items():
             score = 0
+            exact = 0
             for keyword in keywords:
                 # Substring match (e.g., 'news' in 'kenyanews')
                 if keyword in user_input_lower:
                     score += 1
                     # Exact word match (e.g., ' news ' in ' latest news today ')
-                    if f" {keyword} " in f" {user_input_lower} ":
+                    if f" {keyword} " in padded:
                         score += 2
-            
+                        exact += 1
+            if score:
+                scores[skill_name] = (score, exact)
+
+        return scores
+
+    def _find_skill_by_keywords(self, user_input: str) -> Optional[str]:
+        """
+        Calculates a confidence score based on keyword frequency and exact matching.
+        """
+        user_input_lower = user_input.lower()
+        best_score = 0
+        best_skill = None
+
+        for skill_name, (score, _) in self.score_skills(user_input).items():
             if score > best_score:
                 best_score = score
                 best_skill = skill_name
@@ -58,7 +74,20 @@ class SkillBridge:
                     return skill_name
         
         return None
-    
+
+    def strong_match(self, user_input: str, min_exact: int = 2) -> Optional[str]:
+        """
+        The skill only when the match is unambiguous: it is the single skill
+        with any keyword hit and at least `min_exact` distinct keywords match
+        as whole words. One shared word ('home', 'camera', 'how are you') is
+        not enough to bypass the semantic model.
+        """
+        scores = self.score_skills(user_input)
+        if len(scores) != 1:
+            return None
+        skill_name, (_, exact) = next(iter(scores.items()))
+        return skill_name if exact >= min_exact else None
+
     def try_run(self, user_input: str):
         """
         The bridge between raw text and SkillManager execution.
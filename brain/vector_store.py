@@ -0,0 +1,113 @@
+from typing import Optional
+
+import numpy as np
+
+STORAGE_TYPES = ("float32", "float16", "int8")
+
+
+class CompactVectorStore:
+    """
+    Read-only cosine-similarity store for unit vectors, kept in compact form.
+
+    - pca_dim: optional PCA projection fitted on the stored vectors; rows
+      and queries are re-normalized after projection.
+    - storage: float32 (as given, no copy), float16, or int8 with one
+      float32 scale per row.
+
+    Scoring works block by block on the compact rows, so only `block_rows`
+    rows are ever widened to float32 at once and RSS tracks the compact size.
+    """
+
+    def __init__(self, vectors: np.ndarray, storage: str = "float32", pca_dim: Optional[int] = None,
+                 block_rows: int = 4096):
+        if storage not in STORAGE_TYPES:
+            raise ValueError(f"storage must be one of {STORAGE_TYPES}, got {storage!r}")
+
+        self.storage = storage
+        self.block_rows = block_rows
+        self.mean = None
+        self.components = None
+
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if pca_dim and pca_dim < vectors.shape[1]:
+            vectors = self._fit_pca(vectors, pca_dim)
+
+        self.dim = vectors.shape[1]
+        self.scales = None
+
+        if storage == "float32":
+            self.data = vectors
+        elif storage == "float16":
+            self.data = vectors.astype(np.float16)
+        else:
+            peak = np.abs(vectors).max(axis=1)
+            peak[peak == 0] = 1.0
+            self.scales = (peak / 127.0).astype(np.float32)
+            self.data = np.round(vectors / self.scales[:, None]).astype(np.int8)
+
+    def __len__(self):
+        return self.data.shape[0]
+
+    @property
+    def nbytes(self) -> int:
+        extra = 0 if self.scales is None else self.scales.nbytes
+        if self.components is not None:
+            extra += self.components.nbytes + self.mean.nbytes
+        return self.data.nbytes + extra
+
+    # =========================================================
+    # PROJECTION
+    # =========================================================
+
+    def _fit_pca(self, vectors: np.ndarray, pca_dim: int) -> np.ndarray:
+        self.mean = vectors.mean(axis=0)
+        _, _, vt = np.linalg.svd(vectors - self.mean, full_matrices=False)
+        self.components = np.ascontiguousarray(vt[:pca_dim], dtype=np.float32)
+        return _normalize_rows((vectors - self.mean) @ self.components.T)
+
+    def project(self, queries: np.ndarray) -> np.ndarray:
+        """Queries in the stored space, unit length, shape (batch, dim)."""
+        q = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        if self.components is not None:
+            q = (q - self.mean) @ self.components.T
+        return _normalize_rows(q)
+
+    # =========================================================
+    # SCORING
+    # =========================================================
+
+    def scores(self, query: np.ndarray) -> np.ndarray:
+        return self.scores_batch(query)[0]
+
+    def scores_batch(self, queries: np.ndarray) -> np.ndarray:
+        """(batch, rows) cosine similarities."""
+        q = self.project(queries)
+        if self.storage == "float32":
+            return q @ self.data.T
+
+        out = np.empty((q.shape[0], len(self)), dtype=np.float32)
+        for start in range(0, len(self), self.block_rows):
+            end = start + self.block_rows
+            block = self.data[start:end].astype(np.float32)
+            out[:, start:end] = q @ block.T
+            if self.scales is not None:
+                out[:, start:end] *= self.scales[start:end]
+        return out
+
+
+def recall_at_k(reference: np.ndarray, store: CompactVectorStore, queries: np.ndarray, k: int = 5) -> float:
+    """Share of full-precision top-k neighbours that the compact store also ranks top-k."""
+    k = min(k, len(store))
+    exact = _normalize_rows(np.atleast_2d(queries).astype(np.float32)) @ _normalize_rows(reference).T
+    approx = store.scores_batch(queries)
+
+    exact_top = np.argpartition(-exact, k - 1, axis=1)[:, :k]
+    approx_top = np.argpartition(-approx, k - 1, axis=1)[:, :k]
+    hits = sum(len(set(a) & set(b)) for a, b in zip(exact_top, approx_top))
+    return hits / float(exact_top.size)
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
@@ -2,6 +2,7 @@ import sys
 import os
 import logging
 from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 # --- STEP 1: JUMP OUT OF THE BRAIN FOLDER ---
@@ -44,11 +45,24 @@ def home():
 async def ask_crystal(request: ChatRequest):
     logger.info(f"Incoming: {request.message}")
     try:
-        response = crystal.process(request.message)
+        response = await crystal.aprocess(request.message, conversation_id=request.user_id)
         return {"type": "speech", "text": response}
     except Exception as e:
         return {"type": "error", "text": str(e)}
 
+@app.post("/ask/stream")
+def ask_crystal_stream(request: ChatRequest):
+    # Plain text chunks as Ollama produces them; the generator runs in the threadpool
+    logger.info(f"Incoming (stream): {request.message}")
+
+    def tokens():
+        try:
+            yield from crystal.stream_process(request.message, conversation_id=request.user_id)
+        except Exception as e:
+            yield f"\n[error] {e}"
+
+    return StreamingResponse(tokens(), media_type="text/plain")
+
 # --- STEP 5: EXECUTION ---
 if __name__ == "__main__":
     import uvicorn
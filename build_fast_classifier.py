@@ -0,0 +1,85 @@
+"""
+Builds the first-tier intent classifier used by IntentRouter before MiniLM.
+
+Training data: the intent phrases in core/custom_commands.json plus, when
+present, the Rasa NLU export written by p.py (nlu.yml). The "none"
+utterances of core/routing_corpus.json train an off-topic class, so chat
+like "what do you think about music" is not forced onto a skill. Run from
+the project root after changing any of these files:
+
+    python build_fast_classifier.py
+"""
+import argparse
+import json
+import os
+import time
+
+from brain.fast_classifier import DEFAULT_MODEL_PATH, NONE_LABEL, FastIntentClassifier
+
+TEMPLATES = ["{}", "please {}", "can you {}", "{} now", "crystal {}"]
+
+
+def load_commands(path: str):
+    with open(path, "r") as f:
+        data = json.load(f)
+    data.pop("imperative_verbs", None)
+
+    for intent, phrases in data.items():
+        if isinstance(phrases, str):
+            continue  # learned trigger → response mapping
+        for phrase in phrases:
+            for template in TEMPLATES:
+                yield template.format(phrase), intent
+
+
+def load_nlu(path: str):
+    """Minimal reader for the nlu.yml layout p.py generates."""
+    if not os.path.exists(path):
+        return
+    intent = None
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            stripped = line.strip()
+            if stripped.startswith("- intent:"):
+                intent = stripped.split(":", 1)[1].strip()
+            elif intent and stripped.startswith("- "):
+                yield stripped[2:].strip(), intent
+
+
+def load_none(path: str):
+    """Off-topic utterances from the routing corpus, labelled NONE_LABEL."""
+    if not os.path.exists(path):
+        return
+    with open(path, "r", encoding="utf-8") as f:
+        utterances = json.load(f)["utterances"]
+    for item in utterances:
+        if item["intent"] == NONE_LABEL:
+            for template in TEMPLATES:
+                yield template.format(item["text"]), NONE_LABEL
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--commands", default=os.path.join("core", "custom_commands.json"))
+    parser.add_argument("--nlu", default="nlu.yml")
+    parser.add_argument("--corpus", default=os.path.join("core", "routing_corpus.json"))
+    parser.add_argument("--out", default=DEFAULT_MODEL_PATH)
+    parser.add_argument("--epochs", type=int, default=40)
+    args = parser.parse_args()
+
+    examples = list(load_commands(args.commands)) + list(load_nlu(args.nlu)) + list(load_none(args.corpus))
+    print(f"📚 {len(examples)} examples, {len({label for _, label in examples})} labels")
+
+    started = time.perf_counter()
+    model = FastIntentClassifier.train(examples, epochs=args.epochs)
+    print(f"🏋️ Trained in {time.perf_counter() - started:.1f}s")
+
+    correct = sum(1 for text, label in examples if (model.predict(text) or (NONE_LABEL,))[0] == label)
+    print(f"🎯 Confident + correct on training set: {correct}/{len(examples)}")
+
+    model.save(args.out)
+    print(f"✅ Saved {args.out} ({os.path.getsize(args.out) / 1024:.0f} KB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""
+Offline threshold calibration for IntentJudge.
+
+Scores the labeled corpus once, then grid-searches a (high, medium, margin)
+triple per intent that maximizes direct-execution utility: correct executes
+count +1, wrong executes are penalized hardest, and every confirm/clarify
+turn costs a user round trip. Results are written next to the intent file
+(core/custom_commands.thresholds.json), which IntentJudge loads at start and
+hot-reloads.
+
+Per-intent groups are small, so the in-sample "after" numbers are fitted to
+the data they are measured on. The report also gives leave-one-out numbers:
+each utterance is scored with thresholds fitted without it. An intent
+keeps its fitted triple only when that held-out utility beats the global
+defaults on the same utterances; otherwise the defaults are written for it.
+
+    python calibrate_thresholds.py
+    python calibrate_thresholds.py --dry-run
+"""
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import os
+from collections import defaultdict
+
+import numpy as np
+
+from brain.intent_judge import IntentJudge, decide_action
+
+NONE = "none"
+
+CORRECT = 1.0
+WRONG_EXECUTE = -2.0
+ROUND_TRIP = -0.3
+MISSED = -0.5
+
+HIGH_GRID = np.round(np.arange(0.30, 0.951, 0.025), 3)
+MEDIUM_GRID = np.round(np.arange(0.20, 0.951, 0.025), 3)
+MARGIN_GRID = np.round(np.arange(0.0, 0.151, 0.01), 3)
+
+
+def utility(action: str, top_intent: str, expected: str) -> float:
+    if action == "execute":
+        return CORRECT if top_intent == expected else WRONG_EXECUTE
+    if action in ("confirm", "clarify"):
+        return ROUND_TRIP
+    return CORRECT if expected == NONE else MISSED
+
+
+def group_score(samples, high, medium, margin) -> float:
+    return sum(
+        utility(decide_action(scores, high, medium, margin)[0], scores[0][0], expected)
+        for scores, expected in samples
+    )
+
+
+def calibrate_intent(samples, defaults):
+    """Best (high, medium, margin); ties go to the triple closest to the defaults."""
+    best, best_key = defaults, (group_score(samples, *defaults), 0.0)
+    for high in HIGH_GRID:
+        for medium in MEDIUM_GRID[MEDIUM_GRID <= high]:
+            for margin in MARGIN_GRID:
+                candidate = (float(high), float(medium), float(margin))
+                distance = sum(abs(a - b) for a, b in zip(candidate, defaults))
+                key = (group_score(samples, *candidate), -distance)
+                if key > best_key:
+                    best, best_key = candidate, key
+    return best
+
+
+def leave_one_out(samples, defaults, min_support: int):
+    """Per sample, the triple fitted on the rest of its group (defaults below min_support)."""
+    fitted = []
+    for i in range(len(samples)):
+        rest = samples[:i] + samples[i + 1:]
+        fitted.append(calibrate_intent(rest, defaults) if len(rest) >= min_support else defaults)
+    return fitted
+
+
+def evaluate(ranked, labels, thresholds) -> dict:
+    """thresholds: one (high, medium, margin) per utterance."""
+    counts = defaultdict(int)
+    for scores, expected, triple in zip(ranked, labels, thresholds):
+        action, _ = decide_action(scores, *triple)
+        if action == "execute":
+            counts["correct_execute" if scores[0][0] == expected else "wrong_execute"] += 1
+        else:
+            counts[action] += 1
+
+    actionable = sum(1 for label in labels if label != NONE)
+    return {
+        "direct_accuracy": round(counts["correct_execute"] / actionable, 3) if actionable else 0.0,
+        "wrong_execute": counts["wrong_execute"],
+        "round_trips": counts["confirm"] + counts["clarify"],
+        "none": counts["none"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", default=os.path.join("core", "routing_corpus.json"))
+    parser.add_argument("--min-support", type=int, default=3, help="fewer samples keeps the global thresholds")
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    with open(args.corpus, "r", encoding="utf-8") as f:
+        corpus = json.load(f)["utterances"]
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        judge = IntentJudge()
+
+    texts = [u["text"].lower().strip() for u in corpus]
+    labels = [u["intent"] for u in corpus]
+    embeddings = judge.model.encode(texts, normalize_embeddings=True, convert_to_numpy=True)
+    ranked = judge.index.rank_batch(embeddings)
+
+    defaults = (judge.HIGH_CONFIDENCE, judge.MEDIUM_CONFIDENCE, judge.AMBIGUITY_MARGIN)
+
+    # An intent's thresholds only apply when it is the top match, so group by that
+    groups = defaultdict(list)
+    for i, (scores, expected) in enumerate(zip(ranked, labels)):
+        groups[scores[0][0]].append((scores, expected, i))
+
+    calibrated = {}
+    held_out = [defaults] * len(ranked)
+    for intent, members in sorted(groups.items()):
+        if len(members) < args.min_support:
+            continue
+        samples = [(scores, expected) for scores, expected, _ in members]
+        high, medium, margin = calibrate_intent(samples, defaults)
+
+        fitted = leave_one_out(samples, defaults, args.min_support)
+        for (_, _, i), triple in zip(members, fitted):
+            held_out[i] = triple
+
+        # Any fitted value (a lower high, a looser medium, a zero margin) must hold up on unseen utterances
+        loo_utility = sum(
+            utility(decide_action(scores, *triple)[0], scores[0][0], expected)
+            for (scores, expected), triple in zip(samples, fitted)
+        )
+        default_utility = group_score(samples, *defaults)
+        if loo_utility <= default_utility:
+            high, medium, margin = defaults
+
+        calibrated[intent] = {
+            "high": high, "medium": medium, "margin": margin, "support": len(samples),
+            "held_out_utility": round(loo_utility, 2), "default_utility": round(default_utility, 2),
+        }
+
+    def final(intent):
+        return tuple(calibrated.get(intent, {}).get(k, d) for k, d in zip(("high", "medium", "margin"), defaults))
+
+    before = evaluate(ranked, labels, [defaults] * len(ranked))
+    # In-sample numbers for exactly the thresholds that get written
+    after = evaluate(ranked, labels, [final(scores[0][0]) for scores in ranked])
+    after_held_out = evaluate(ranked, labels, held_out)
+
+    kept = sum(1 for intent in calibrated if final(intent) != tuple(defaults))
+    print(f"Intents calibrated: {len(calibrated)}/{len(groups)} (min support {args.min_support}), "
+          f"{kept} kept fitted thresholds, {len(calibrated) - kept} fell back to the defaults")
+    print(f"Before:                  {before}")
+    print(f"After (in-sample):       {after}")
+    print(f"After (leave-one-out):   {after_held_out}")
+
+    if args.dry_run:
+        return
+
+    report = {
+        "meta": {
+            "generated": datetime.datetime.now().isoformat(timespec="seconds"),
+            "corpus": args.corpus,
+            "model": judge.MODEL_NAME,
+            "backend": judge.BACKEND,
+            "defaults": dict(zip(("high", "medium", "margin"), defaults)),
+            "before": before,
+            "after_in_sample": after,
+            "after_leave_one_out": after_held_out,
+        },
+        "intents": calibrated,
+    }
+    with open(judge.thresholds_path, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"✅ Wrote {judge.thresholds_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Parity check: IntentJudge routing on the ONNX (int8) backend vs. torch.
+
+Every phrase in core/custom_commands.json, plus a couple of light rewordings,
+is routed through both backends; the action/intent pairs must match.
+
+    python check_onnx_parity.py --export   # one-off: build models/minilm-onnx
+    python check_onnx_parity.py            # compare backends, exit 1 on mismatch
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+from brain.intent_judge import IntentJudge
+from brain.onnx_encoder import DEFAULT_ONNX_DIR, export_onnx_model
+
+VARIANTS = ["{}", "please {}", "can you {} now"]
+
+
+def build_corpus(judge: IntentJudge):
+    corpus = []
+    for phrases in judge.intents.values():
+        if isinstance(phrases, str):
+            continue  # learned trigger → response mapping, not an intent
+        for phrase in phrases:
+            corpus.extend(v.format(phrase) for v in VARIANTS)
+    return corpus
+
+
+def route_all(judge: IntentJudge, corpus):
+    decisions = []
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for text in corpus:
+            d = judge.detect_intent(text)
+            decisions.append((d.get("action"), d.get("intent")))
+    return decisions, (time.perf_counter() - start) / max(len(corpus), 1) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--export", action="store_true", help="export + quantize the model first")
+    parser.add_argument("--onnx-dir", default=DEFAULT_ONNX_DIR)
+    parser.add_argument("--max-mismatch", type=int, default=0, help="allowed routing differences")
+    args = parser.parse_args()
+
+    if args.export:
+        export_onnx_model(out_dir=args.onnx_dir)
+
+    os.environ["CRYSTAL_ONNX_DIR"] = args.onnx_dir
+    torch_judge = IntentJudge(backend="torch")
+    onnx_judge = IntentJudge(backend="onnx")
+
+    corpus = build_corpus(torch_judge)
+    torch_routes, torch_ms = route_all(torch_judge, corpus)
+    onnx_routes, onnx_ms = route_all(onnx_judge, corpus)
+
+    a = torch_judge.model.encode(corpus, normalize_embeddings=True, convert_to_numpy=True)
+    b = onnx_judge.model.encode(corpus, normalize_embeddings=True, convert_to_numpy=True)
+    cosine = (a * b).sum(axis=1)
+
+    mismatches = [
+        (text, t, o)
+        for text, t, o in zip(corpus, torch_routes, onnx_routes)
+        if t != o
+    ]
+
+    print("\n--- IntentJudge ONNX Parity Report ---")
+    print(f"Utterances:        {len(corpus)}")
+    print(f"Embedding cosine:  mean {cosine.mean():.4f} | min {cosine.min():.4f}")
+    print(f"Latency / call:    torch {torch_ms:.2f} ms | onnx {onnx_ms:.2f} ms")
+    print(f"Routing mismatch:  {len(mismatches)}")
+    for text, t, o in mismatches[:20]:
+        print(f"  ❌ '{text}': torch={t} onnx={o}")
+
+    if len(mismatches) > args.max_mismatch:
+        sys.exit(1)
+    print("✅ Backends agree.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Recall check for compact embedding storage (brain/vector_store.py).
+
+Compares float16 / int8 storage, with and without PCA, against full float32
+cosine search: recall@1 and recall@5 of nearest phrases, top-intent agreement
+through IntentIndex, stored bytes and scoring time.
+
+    python check_vector_store.py                 # real phrases + routing corpus
+    python check_vector_store.py --synthetic 20000
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import time
+
+import numpy as np
+
+from brain.intent_index import IntentIndex
+from brain.vector_store import CompactVectorStore, recall_at_k
+
+CONFIGS = [
+    ("float32", None),
+    ("float16", None),
+    ("int8", None),
+    ("float32", 128),
+    ("float16", 128),
+    ("int8", 128),
+    ("int8", 64),
+]
+
+
+def synthetic(rows: int, dim: int = 384, latent: int = 48, per_intent: int = 8, seed: int = 0):
+    """Clustered, roughly low-rank unit vectors, shaped like sentence embeddings."""
+    rng = np.random.default_rng(seed)
+    basis = rng.standard_normal((latent, dim)).astype(np.float32)
+    n_intents = max(rows // per_intent, 1)
+    centers = rng.standard_normal((n_intents, latent)).astype(np.float32)
+
+    counts = [per_intent] * n_intents
+    latent_rows = np.repeat(centers, per_intent, axis=0) + 0.4 * rng.standard_normal((n_intents * per_intent, latent))
+    vectors = latent_rows @ basis + 0.5 * rng.standard_normal((n_intents * per_intent, dim))
+
+    picks = rng.integers(0, len(latent_rows), 256)
+    queries = (latent_rows[picks] + 0.3 * rng.standard_normal((256, latent))) @ basis
+    names = [f"intent_{i}" for i in range(n_intents)]
+    return _unit(vectors), counts, names, _unit(queries)
+
+
+def real(corpus_path: str):
+    from brain.intent_judge import IntentJudge
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        judge = IntentJudge()
+
+    names, counts, phrases = [], [], []
+    for intent, intent_phrases in judge.intents.items():
+        if intent_phrases:
+            names.append(intent)
+            counts.append(len(intent_phrases))
+            phrases.extend(intent_phrases)
+
+    with open(corpus_path, "r", encoding="utf-8") as f:
+        texts = [u["text"] for u in json.load(f)["utterances"]]
+
+    encode = lambda t: judge.model.encode(t, normalize_embeddings=True, convert_to_numpy=True)
+    return encode(phrases), counts, names, encode(texts)
+
+
+def _unit(m):
+    m = np.asarray(m, dtype=np.float32)
+    return m / np.linalg.norm(m, axis=1, keepdims=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--synthetic", type=int, default=0, help="use N synthetic rows instead of the model")
+    parser.add_argument("--corpus", default=os.path.join("core", "routing_corpus.json"))
+    args = parser.parse_args()
+
+    if args.synthetic:
+        vectors, counts, names, queries = synthetic(args.synthetic)
+    else:
+        vectors, counts, names, queries = real(args.corpus)
+
+    reference = IntentIndex(vectors, names, counts, normalized=True)
+    reference_top = reference.score_batch(queries).argmax(axis=1)
+
+    print(f"Rows: {len(vectors)} x {vectors.shape[1]} | intents: {len(names)} | queries: {len(queries)}\n")
+    print(f"{'storage':>8} {'pca':>5} {'KB':>9} {'R@1':>7} {'R@5':>7} {'intent':>7} {'ms/q':>7}")
+
+    for storage, pca_dim in CONFIGS:
+        if pca_dim and pca_dim >= min(vectors.shape):
+            continue
+        store = CompactVectorStore(vectors, storage=storage, pca_dim=pca_dim)
+        index = IntentIndex(vectors, names, counts, normalized=True, storage=storage, pca_dim=pca_dim)
+
+        started = time.perf_counter()
+        top = index.score_batch(queries).argmax(axis=1)
+        ms = (time.perf_counter() - started) * 1000 / len(queries)
+
+        print(
+            f"{storage:>8} {str(pca_dim or '-'):>5} {store.nbytes / 1024:>9.1f} "
+            f"{recall_at_k(vectors, store, queries, 1):>7.3f} {recall_at_k(vectors, store, queries, 5):>7.3f} "
+            f"{(top == reference_top).mean():>7.3f} {ms:>7.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -160,16 +160,26 @@ class SkillManager:
         # =================================================
         # 3️⃣ KEYWORD FALLBACK (ONLY IF NO INTENT RESULT)
         # =================================================
+        s = self.match_skill(user_input)
+        if s:
+            return s["instance"].run({
+                "user_input": user_input,
+                "intent": None,
+                "entities": entities
+            })
+
+        return None
+
+    # =====================================================
+    # MATCH SKILL (KEYWORD FALLBACK, NO EXECUTION)
+    # =====================================================
+    def match_skill(self, user_input: str) -> Optional[Dict]:
+        """First runnable skill whose keyword appears as a whole word."""
+        lowered = user_input.lower()
         for s in self.skills:
             for kw in s["keywords"]:
-                if re.search(rf"\b{re.escape(kw.lower())}\b", user_input.lower()):
-                    inst = s["instance"]
-                    can_run, msg = inst.check_requirements()
+                if re.search(rf"\b{re.escape(kw.lower())}\b", lowered):
+                    can_run, msg = s["instance"].check_requirements()
                     if can_run:
-                        return inst.run({
-                            "user_input": user_input,
-                            "intent": None,
-                            "entities": entities
-                        })
-
+                        return s
         return None
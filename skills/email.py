@@ -14,7 +14,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 try:
     from brain.llm import run_llm  # If llm is in a folder named brain
 except ImportError:
-    import brain.llm                     # If llm.py is in the root folder
+    from llm import run_llm              # If llm.py is in the root folder
 
 # Load the secret vault
 load_dotenv()
@@ -78,6 +78,16 @@ class EmailSkill(Skill):
         except Exception as e:
             return f"❌ Error reading inbox: {e}"
 
+    @staticmethod
+    def _looks_cut_off(body: str, user_input: str) -> bool:
+        """Empty body, or one ending in a fragment of a word the user actually said."""
+        words = body.strip().rstrip(".!?,;:'\"").split()
+        if not words:
+            return True
+        said = user_input.lower().split()
+        last = words[-1].lower()
+        return last not in said and any(w.startswith(last) and w != last for w in said)
+
     def run(self, parameters: dict):
         user_input = parameters.get("user_input", "").lower()
 
@@ -92,12 +102,16 @@ class EmailSkill(Skill):
                 {"role": "user", "content": user_input}
             ]
             
-            extracted = run_llm(prompt)
+            # The body is free text, so it gets the full reply budget, not the short-field one
+            extracted = run_llm(prompt, task_type="compose")
             
             if "ERROR" in extracted or "|" not in extracted:
                 return "Who should I email, and what should I say? (e.g., 'Email boss@work.com saying I am done.')"
 
             recipient, body = extracted.split("|", 1)
+            if getattr(extracted, "truncated", False) or self._looks_cut_off(body, user_input):
+                return "⚠️ Your message came out cut off, so I did not send it. Could you say it again, maybe shorter?"
+
             return self.send_email(recipient.strip(), "Automated Message from Crystal", body.strip())
 
         return "I can read your inbox or send an email. Which would you like?"
\ No newline at end of file
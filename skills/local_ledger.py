@@ -10,7 +10,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 try:
     from brain.llm import run_llm  # If llm is in a folder named brain
 except ImportError:
-    import brain.llm                     # If llm.py is in the root folder
+    from llm import run_llm              # If llm.py is in the root folder
 
 class LocalLedgerSkill(Skill):
     name = "Local Ledger"
@@ -40,7 +40,7 @@ class LocalLedgerSkill(Skill):
             {"role": "system", "content": "Analyze input. Return ONLY: ADD, SPEND, or BALANCE."},
             {"role": "user", "content": user_input}
         ]
-        action = run_llm(action_prompt).strip().upper()
+        action = run_llm(action_prompt, task_type="classify").strip().upper()
 
         if "BALANCE" in action:
             return f"Lucky, your local balance is {self.get_balance()} shillings."
@@ -50,7 +50,7 @@ class LocalLedgerSkill(Skill):
             {"role": "system", "content": "Extract Amount and Item. Return as: Amount | Item. Example: 500 | Coffee"},
             {"role": "user", "content": user_input}
         ]
-        extracted = run_llm(data_prompt).split("|")
+        extracted = run_llm(data_prompt, task_type="extract").split("|")
         
         try:
             amount = float(extracted[0].strip())
@@ -1,6 +1,11 @@
 import requests
 from skill_manager import Skill
 
+try:
+    from brain.context_providers import DEFAULT_LOCATION, register_provider
+except ImportError:
+    register_provider = None
+
 class LocationSkill(Skill):
     name = "Location Sentinel"
     description = "Automatically detects the device's physical location."
@@ -11,7 +16,18 @@ class LocationSkill(Skill):
         self.city = "Unknown"
         self.lat = 0.0
         self.lon = 0.0
-        self.update_location() # Get location as soon as Crystal wakes up
+        # Get location as soon as Crystal wakes up; prompts read the city from
+        # the context snapshot, re-detected every 30 minutes. The geo-IP
+        # lookup runs on its own thread, prompts see the default until then.
+        if register_provider:
+            register_provider("location", self._context_location, ttl=1800,
+                              default=DEFAULT_LOCATION, slow=True)
+        else:
+            self.update_location()
+
+    def _context_location(self):
+        self.update_location()
+        return None if self.city == "Unknown" else self.city
 
     def update_location(self):
         """Pings free APIs to find the device's current city and coordinates."""